@@ -5,6 +5,13 @@ Frontend that connects to deployed TMDB-powered FastAPI backend
 import streamlit as st
 from services.api_client import api_client
 from components.movie_display import display_movie_grid_with_posters, show_enhanced_movie_details
+from components.movie_search import display_movie_search
+from services.recommendation_rotation import RecommendationRotator
+from services.tracing import tracer
+from services.memory_watchdog import start_memory_watchdog
+from utils.session_analytics import SessionAnalytics
+from utils.constants import RECOMMENDATION_COUNTS
+from utils.assets import inject_styles
 
 st.set_page_config(
     page_title="Movie Recommendation System",
@@ -13,96 +20,100 @@ st.set_page_config(
     initial_sidebar_state="collapsed"
 )
 
-# Enhanced CSS for professional movie app look
-st.markdown("""
-<style>
-.main-header {
-    text-align: center;
-    padding: 3rem 0;
-    background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-    border-radius: 20px;
-    margin-bottom: 2rem;
-    color: white;
-    box-shadow: 0 10px 30px rgba(0,0,0,0.2);
-}
+# Bundled, minified stylesheet served as a cacheable static file
+inject_styles()
 
-.genre-card {
-    background: linear-gradient(45deg, #667eea, #764ba2);
-    padding: 20px;
-    border-radius: 15px;
-    text-align: center;
-    color: white;
-    margin: 10px 0;
-    box-shadow: 0 8px 20px rgba(0,0,0,0.1);
-    transition: all 0.3s ease;
-    cursor: pointer;
-}
-
-.genre-card:hover {
-    transform: translateY(-5px);
-    box-shadow: 0 12px 30px rgba(0,0,0,0.2);
-}
-
-.stButton > button {
-    border-radius: 12px;
-    border: none;
-    transition: all 0.3s ease;
-    font-weight: 600;
-}
-
-.stButton > button:hover {
-    transform: translateY(-2px);
-    box-shadow: 0 8px 20px rgba(0,0,0,0.2);
-}
+def render_session_insights(analytics: SessionAnalytics):
+    """Session-wide rating, genre and decade breakdown from the analytics history"""
+    if not len(analytics):
+        return
+    
+    with st.expander(f"📈 Session Insights ({len(analytics)} unique movies, {analytics.total_views} shown)"):
+        percentiles = analytics.rating_percentiles()
+        col1, col2, col3, col4 = st.columns(4)
+        col1.metric("📉 25th pct", f"{percentiles[25]:.1f}" if percentiles else "—")
+        col2.metric("📊 Median", f"{percentiles[50]:.1f}" if percentiles else "—")
+        col3.metric("📈 75th pct", f"{percentiles[75]:.1f}" if percentiles else "—")
+        col4.metric("🏆 90th pct", f"{percentiles[90]:.1f}" if percentiles else "—")
+        
+        genre_col, rating_col, decade_col = st.columns(3)
+        with genre_col:
+            st.markdown("**🎭 Genre Mix**")
+            for genre, share in analytics.genre_mix(top=6):
+                st.progress(share, text=f"{genre} — {share:.0%}")
+        with rating_col:
+            st.markdown("**⭐ Rating Distribution**")
+            ratings = {band: count for band, count in analytics.rating_distribution().items() if count}
+            most = max(ratings.values(), default=1)
+            for band, count in ratings.items():
+                st.progress(count / most, text=f"{band} — {count}")
+        with decade_col:
+            st.markdown("**📅 Movies per Decade**")
+            decades = analytics.decade_histogram()
+            most = max(decades.values(), default=1)
+            for decade, count in decades.items():
+                st.progress(count / most, text=f"{decade} — {count}")
 
-.movie-stats {
-    background: #f8f9fa;
-    padding: 15px;
-    border-radius: 10px;
-    margin: 10px 0;
-}
-</style>
-""", unsafe_allow_html=True)
+def show_backend_waking_up():
+    """Explain a sleeping backend and offer an explicit reconnect"""
+    st.error("⚠️ Movie database is starting up... Please wait 30-60 seconds and refresh.")
+    st.info("🎬 Our backend is deployed on Render and may need a moment to wake up from sleep mode.")
+    if st.button("🔄 Retry Connection", type="primary"):
+        with st.spinner("🎬 Connecting to movie database..."):
+            api_client.get_health()
+        st.rerun()
 
 def main():
+    api_client.begin_rerun()
+    start_memory_watchdog()
+    
     # App Header with enhanced design
     st.markdown("""
     <div class="main-header">
-        <h1 style="font-size: 3rem; margin-bottom: 10px; font-weight: 700;">🎬 CinemaScope</h1>
-        <p style="font-size: 1.4rem; margin: 0; opacity: 0.9; font-weight: 300;">
+        <h1>🎬 CinemaScope</h1>
+        <p class="tagline">
             Discover Amazing Movies with Real Posters & Reviews
         </p>
-        <p style="font-size: 1rem; margin-top: 10px; opacity: 0.7;">
+        <p class="note">
             If not Loading use a VPN
-        <p style="font-size: 1rem; margin-top: 10px; opacity: 0.7;">
+        <p class="note">
             Powered by The Movie Database (TMDB)
         </p>
     </div>
     """, unsafe_allow_html=True)
     
-    # Backend connection status with better UX
-    with st.spinner("🎬 Connecting to movie database..."):
-        health_status = api_client.get_health()
-    
-    if health_status.get("status") != "healthy":
-        st.error("⚠️ Movie database is starting up... Please wait 30-60 seconds and refresh.")
-        st.info("🎬 Our backend is deployed on Render and may need a moment to wake up from sleep mode.")
-        if st.button("🔄 Retry Connection", type="primary"):
-            st.rerun()
+    # Backend status inferred from recent API calls - no request of its own
+    if api_client.health_status()["status"] == "unhealthy":
+        show_backend_waking_up()
         return
     
-    st.success("✅ Connected to TMDB movie database! Ready to discover movies.")
-    
-    # Genre selection with enhanced UX
-    st.markdown("### 🎭 What Kind of Movies Do You Love?")
-    
     with st.spinner("Loading movie genres..."):
         available_genres = api_client.get_genres()
     
     if not available_genres:
-        st.error("Could not load genres. Please refresh the page.")
+        if api_client.health_status()["status"] == "unhealthy":
+            show_backend_waking_up()
+        else:
+            st.error("Could not load genres. Please refresh the page.")
         return
     
+    st.success("✅ Connected to TMDB movie database! Ready to discover movies.")
+    
+    if 'session_analytics' not in st.session_state:
+        st.session_state.session_analytics = SessionAnalytics()
+    analytics = st.session_state.session_analytics
+    
+    # Serves unseen movies from a buffered pool, over-fetching from the backend when it runs dry
+    if 'rotator' not in st.session_state:
+        st.session_state.rotator = RecommendationRotator(api_client.get_movie_recommendations)
+    rotator = st.session_state.rotator
+    
+    # Instant search over movies already loaded (no backend round trip)
+    display_movie_search()
+    
+    # Genre selection with enhanced UX
+    st.markdown("### 🎭 What Kind of Movies Do You Love?")
+    
     # Enhanced genre selection with description
     selected_genre = st.selectbox(
         "Choose your favorite genre:",
@@ -121,10 +132,10 @@ def main():
             with genre_cols[i % 4]:
                 st.markdown(f"""
                 <div class="genre-card">
-                    <div style="font-size: 2rem; margin-bottom: 8px;">
+                    <div class="genre-icon">
                         {['🎬', '🗺️', '🎨', '😂', '🔫', '📹', '🎭', '👨‍👩‍👧‍👦', '🧙', '📜', '👻', '🎵'][i % 12]}
                     </div>
-                    <div style="font-weight: bold;">{genre}</div>
+                    <div class="genre-name">{genre}</div>
                 </div>
                 """, unsafe_allow_html=True)
         return
@@ -134,16 +145,17 @@ def main():
     with col1:
         st.markdown(f"### 🍿 Exploring {selected_genre} Movies")
     with col2:
-        count = st.selectbox("Movies to show:", [3, 6, 9, 12, 15], index=1)
+        count = st.selectbox("Movies to show:", RECOMMENDATION_COUNTS, index=1)
     
     # Main action button
     if st.button("🎬 Discover Movies", type="primary", use_container_width=True):
         with st.spinner(f"🔍 Searching for amazing {selected_genre} movies..."):
-            movies = api_client.get_movie_recommendations(selected_genre, count)
+            movies = rotator.next_batch(selected_genre, count)
             if movies:
                 st.session_state.current_movies = movies
                 st.session_state.current_genre = selected_genre
                 st.session_state.current_count = count
+                analytics.record_movies(movies)
                 st.balloons()
                 st.success(f"🎊 Found {len(movies)} fantastic {selected_genre} movies!")
             else:
@@ -188,12 +200,13 @@ def main():
                     del st.session_state.selected_movie_id
                 
                 with st.spinner("Finding new movies..."):
-                    movies = api_client.get_movie_recommendations(
+                    movies = rotator.next_batch(
                         st.session_state.current_genre, 
                         st.session_state.get('current_count', 6)
                     )
                     if movies:
                         st.session_state.current_movies = movies
+                        analytics.record_movies(movies)
                         st.success("🎊 Discovered new movies! Check them out above.")
                     else:
                         st.error("Could not find new movies. Please try again.")
@@ -208,45 +221,41 @@ def main():
                 st.rerun()
         
         # App statistics
+        average = analytics.average_rating()
         st.markdown("---")
         st.markdown(f"""
-        <div style="
-            text-align: center; 
-            background: linear-gradient(135deg, #f5f7fa 0%, #c3cfe2 100%);
-            padding: 20px;
-            border-radius: 15px;
-            margin: 20px 0;
-        ">
-            <h4 style="color: #2c3e50; margin-bottom: 15px;">📊 Your Movie Discovery Session</h4>
-            <div style="display: flex; justify-content: space-around; flex-wrap: wrap;">
-                <div style="margin: 10px;">
-                    <div style="font-size: 2rem; color: #3498db;">🎭</div>
-                    <div style="font-weight: bold; color: #2c3e50;">Genre</div>
-                    <div style="color: #7f8c8d;">{st.session_state.current_genre}</div>
+        <div class="session-panel">
+            <h4>📊 Your Movie Discovery Session</h4>
+            <div class="stats">
+                <div class="stat">
+                    <div class="stat-icon">🎭</div>
+                    <div class="stat-label">Genre</div>
+                    <div class="stat-value">{st.session_state.current_genre}</div>
                 </div>
-                <div style="margin: 10px;">
-                    <div style="font-size: 2rem; color: #e74c3c;">🎬</div>
-                    <div style="font-weight: bold; color: #2c3e50;">Movies Found</div>
-                    <div style="color: #7f8c8d;">{len(st.session_state.current_movies)}</div>
+                <div class="stat">
+                    <div class="stat-icon">🎬</div>
+                    <div class="stat-label">Movies Found</div>
+                    <div class="stat-value">{len(st.session_state.current_movies)}</div>
                 </div>
-                <div style="margin: 10px;">
-                    <div style="font-size: 2rem; color: #f39c12;">⭐</div>
-                    <div style="font-weight: bold; color: #2c3e50;">Avg Rating</div>
-                    <div style="color: #7f8c8d;">{round(sum(m['rating'] for m in st.session_state.current_movies) / len(st.session_state.current_movies), 1)}/10</div>
+                <div class="stat">
+                    <div class="stat-icon">⭐</div>
+                    <div class="stat-label">Session Avg Rating</div>
+                    <div class="stat-value">{f"{average:.1f}/10" if average is not None else "—"}</div>
                 </div>
-                <div style="margin: 10px;">
-                    <div style="font-size: 2rem; color: #9b59b6;">🎪</div>
-                    <div style="font-weight: bold; color: #2c3e50;">Data Source</div>
-                    <div style="color: #7f8c8d;">TMDB API</div>
+                <div class="stat">
+                    <div class="stat-icon">🎪</div>
+                    <div class="stat-label">Data Source</div>
+                    <div class="stat-value">TMDB API</div>
                 </div>
             </div>
         </div>
         """, unsafe_allow_html=True)
+        render_session_insights(analytics)
     
     # Footer
     st.markdown("---")
     st.markdown("""
-    <div style="text-align: center; color: #7f8c8d; padding: 20px;">
+    <div class="app-footer">
         <p><strong>🎬 CinemaScope</strong> - Your Personal Movie Discovery Platform</p>
         <p>Powered by <a href="https://www.themoviedb.org/" target="_blank">The Movie Database (TMDB)</a></p>
         <p>Built with ❤️ using FastAPI + Streamlit</p>
@@ -254,4 +263,6 @@ def main():
     """, unsafe_allow_html=True)
 
 if __name__ == "__main__":
-    main()
+    # One trace per rerun, sampled at MOVIE_TRACE_SAMPLE_RATE
+    with tracer.start_trace("rerun.main"):
+        main()
@@ -0,0 +1,96 @@
+"""
+Benchmark: per-worker private caches vs one host-wide shared cache
+
+Simulates several Streamlit worker processes behind a load balancer, each
+serving movie-details lookups drawn from a Zipf-like popularity curve. A
+cache miss stands in for a backend call. Reports hit rate, backend calls
+and average cache-operation latency for both setups.
+
+    python -m benchmarks.shared_cache_benchmark --workers 4 --requests 5000
+"""
+import argparse
+import multiprocessing
+import os
+import random
+import tempfile
+import threading
+import time
+from services.response_cache import ResponseCache
+from services.shared_cache import SharedCacheServer, SocketCache
+
+def _movie(movie_id: int) -> dict:
+    return {
+        "id": movie_id, "title": f"Movie {movie_id}", "year": 1970 + movie_id % 55,
+        "genre": "Drama", "rating": round(5 + (movie_id % 50) / 10, 1),
+        "description": "A movie. " * 40, "poster_url": f"https://image.tmdb.org/t/p/w500/{movie_id}.jpg",
+    }
+
+def _worker(socket_path, catalog_size, requests_per_worker, skew, seed, results):
+    cache = SocketCache(socket_path) if socket_path else ResponseCache(max_entries=catalog_size)
+    rng = random.Random(seed)
+    weights = [1 / (rank ** skew) for rank in range(1, catalog_size + 1)]
+    movie_ids = rng.choices(range(catalog_size), weights=weights, k=requests_per_worker)
+
+    hits = 0
+    started = time.perf_counter()
+    for movie_id in movie_ids:
+        key = f"details:{movie_id}"
+        if cache.get(key) is not None:
+            hits += 1
+        else:
+            cache.set(key, _movie(movie_id), ttl=3600)
+    elapsed = time.perf_counter() - started
+    results.put((hits, requests_per_worker, elapsed))
+
+def run(shared: bool, workers: int, catalog_size: int, requests_per_worker: int, skew: float) -> dict:
+    server = socket_path = None
+    if shared:
+        socket_path = os.path.join(tempfile.mkdtemp(), "movie-cache.sock")
+        server = SharedCacheServer(socket_path, max_entries=catalog_size)
+        threading.Thread(target=server.serve_forever, daemon=True).start()
+
+    results = multiprocessing.Queue()
+    processes = [
+        multiprocessing.Process(
+            target=_worker,
+            args=(socket_path, catalog_size, requests_per_worker, skew, seed, results)
+        )
+        for seed in range(workers)
+    ]
+    for process in processes:
+        process.start()
+    outcomes = [results.get() for _ in processes]
+    for process in processes:
+        process.join()
+    if server is not None:
+        server.shutdown()
+        server.server_close()
+
+    hits = sum(outcome[0] for outcome in outcomes)
+    total = sum(outcome[1] for outcome in outcomes)
+    elapsed = sum(outcome[2] for outcome in outcomes)
+    misses = total - hits
+    return {
+        "hit_rate": hits / total,
+        "backend_calls": misses,
+        "avg_op_us": elapsed / (total + misses) * 1e6,  # Every request is a get; each miss adds a set
+        "cached_copies": "1 per host" if shared else f"{workers} (one per worker)",
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--workers", type=int, default=4)
+    parser.add_argument("--catalog-size", type=int, default=2000)
+    parser.add_argument("--requests", type=int, default=5000, help="Lookups per worker")
+    parser.add_argument("--skew", type=float, default=1.0, help="Zipf exponent of movie popularity")
+    args = parser.parse_args()
+
+    print(f"{args.workers} workers x {args.requests} lookups over {args.catalog_size} movies (skew {args.skew})")
+    for shared in (False, True):
+        stats = run(shared, args.workers, args.catalog_size, args.requests, args.skew)
+        label = "shared socket cache" if shared else "private caches     "
+        print(f"{label}  hit rate {stats['hit_rate']:6.1%}  backend calls {stats['backend_calls']:6d}  "
+              f"avg op {stats['avg_op_us']:7.1f}us  copies {stats['cached_copies']}")
+
+if __name__ == "__main__":
+    main()
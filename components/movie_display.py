@@ -2,7 +2,24 @@
 Enhanced movie display components with real TMDB posters
 """
 import streamlit as st
+from services.poster_placeholders import placeholders_for, poster_srcset
+from services.tracing import tracer
+from utils.constants import POSTER_GRID, POSTER_DETAIL
 
+def poster_img_html(movie, layout, placeholder=None, lazy=True):
+    """<img> with explicit dimensions, responsive srcset and an optional blurred placeholder background"""
+    srcset = poster_srcset(movie['poster_url'])
+    attributes = [
+        f'src="{movie["poster_url"]}"',
+        f'srcset="{srcset}" sizes="{layout["sizes"]}"' if srcset else "",
+        f'width="{layout["width"]}" height="{layout["height"]}"',
+        'loading="lazy" decoding="async"' if lazy else 'fetchpriority="high"',
+        f'style="background-image: url({placeholder})"' if placeholder else "",
+        f'alt="{movie["title"]} poster"',
+    ]
+    return f'<img {" ".join(a for a in attributes if a)}>'
+
+@tracer.traced("render.movie_grid")
 def display_movie_grid_with_posters(movies):
     """Display movies with real TMDB posters in a beautiful grid"""
     if not movies:
@@ -12,6 +29,8 @@ def display_movie_grid_with_posters(movies):
     st.subheader(f"🍿 Discovered {len(movies)} Amazing Movies")
     st.markdown("✨ Real movies with real posters from The Movie Database!")
     
+    placeholders = placeholders_for(movies)
+    
     # Display 3 movies per row
     for i in range(0, len(movies), 3):
         cols = st.columns(3)
@@ -23,47 +42,31 @@ def display_movie_grid_with_posters(movies):
                     # Real movie poster or elegant placeholder
                     if movie.get('poster_url'):
                         st.markdown(f"""
-                        <div style="text-align: center; margin-bottom: 15px;">
-                            <img src="{movie['poster_url']}" 
-                                 style="width: 100%; max-width: 200px; border-radius: 12px; 
-                                        box-shadow: 0 8px 24px rgba(0,0,0,0.15);
-                                        transition: transform 0.3s ease;"
-                                 alt="{movie['title']} poster"
-                                 onmouseover="this.style.transform='scale(1.05)'"
-                                 onmouseout="this.style.transform='scale(1)'">
+                        <div class="poster">
+                            {poster_img_html(movie, POSTER_GRID, placeholders.get(movie['id']))}
                         </div>
                         """, unsafe_allow_html=True)
                     else:
                         # Elegant fallback for movies without posters
-                        st.markdown(f"""
-                        <div style="
-                            background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                            height: 280px;
-                            border-radius: 12px;
-                            display: flex;
-                            align-items: center;
-                            justify-content: center;
-                            margin-bottom: 15px;
-                            box-shadow: 0 8px 24px rgba(0,0,0,0.15);
-                        ">
-                            <div style="text-align: center; color: white;">
-                                <div style="font-size: 4rem; margin-bottom: 10px; opacity: 0.8;">🎬</div>
-                                <div style="font-size: 0.9rem; opacity: 0.7;">No Poster Available</div>
+                        st.markdown("""
+                        <div class="poster-placeholder">
+                            <div>
+                                <div class="icon">🎬</div>
+                                <div class="caption">No Poster Available</div>
                             </div>
                         </div>
                         """, unsafe_allow_html=True)
                     
                     # Movie information with better styling
                     st.markdown(f"""
-                    <div style="background: white; padding: 15px; border-radius: 8px; 
-                                box-shadow: 0 2px 8px rgba(0,0,0,0.1); margin-bottom: 15px;">
-                        <h4 style="margin: 0 0 8px 0; color: #2c3e50; font-size: 1.1rem;">
+                    <div class="movie-info">
+                        <h4>
                             {movie['title']}
                         </h4>
-                        <p style="margin: 5px 0; color: #7f8c8d; font-size: 0.9rem;">
+                        <p class="meta">
                             📅 {movie['year']} • 🎭 {movie['genre']}
                         </p>
-                        <p style="margin: 5px 0; color: #f39c12; font-weight: bold; font-size: 0.9rem;">
+                        <p class="rating">
                             ⭐ {movie['rating']}/10
                         </p>
                     </div>
@@ -76,6 +79,7 @@ def display_movie_grid_with_posters(movies):
                 
     return None
 
+@tracer.traced("render.movie_details")
 def show_enhanced_movie_details(movie_details):
     """Enhanced movie details with large poster and comprehensive info"""
     if not movie_details:
@@ -89,28 +93,17 @@ def show_enhanced_movie_details(movie_details):
         # Large poster display
         if movie_details.get('poster_url'):
             st.markdown(f"""
-            <div style="text-align: center;">
-                <img src="{movie_details['poster_url']}" 
-                     style="width: 100%; max-width: 300px; border-radius: 12px; 
-                            box-shadow: 0 12px 32px rgba(0,0,0,0.2);"
-                     alt="{movie_details['title']} poster">
+            <div class="poster detail">
+                {poster_img_html(movie_details, POSTER_DETAIL, placeholders_for([movie_details]).get(movie_details['id']), lazy=False)}
             </div>
             """, unsafe_allow_html=True)
         else:
             # Large elegant placeholder
-            st.markdown(f"""
-            <div style="
-                background: linear-gradient(135deg, #667eea 0%, #764ba2 100%);
-                height: 400px;
-                border-radius: 12px;
-                display: flex;
-                align-items: center;
-                justify-content: center;
-                box-shadow: 0 12px 32px rgba(0,0,0,0.2);
-            ">
-                <div style="text-align: center; color: white;">
-                    <div style="font-size: 6rem; margin-bottom: 15px; opacity: 0.8;">🎬</div>
-                    <div style="font-size: 1.1rem; opacity: 0.7;">No Poster Available</div>
+            st.markdown("""
+            <div class="poster-placeholder detail">
+                <div>
+                    <div class="icon">🎬</div>
+                    <div class="caption">No Poster Available</div>
                 </div>
             </div>
             """, unsafe_allow_html=True)
@@ -135,14 +128,7 @@ def show_enhanced_movie_details(movie_details):
         # Description with better formatting
         st.markdown("### 📝 Overview")
         st.markdown(f"""
-        <div style="
-            background: #f8f9fa; 
-            padding: 20px; 
-            border-radius: 8px; 
-            border-left: 4px solid #667eea;
-            font-size: 1rem;
-            line-height: 1.6;
-        ">
+        <div class="movie-overview">
             {movie_details['description']}
         </div>
         """, unsafe_allow_html=True)
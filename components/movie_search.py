@@ -0,0 +1,48 @@
+"""
+Instant title search over every movie the app has already loaded
+"""
+import streamlit as st
+from services.api_client import api_client
+from services.search_index import search_index
+from components.movie_display import show_enhanced_movie_details
+from utils.constants import SEARCH_RESULT_LIMIT
+
+def display_movie_search():
+    """Search box backed by the local index; results never hit the backend"""
+    if not len(search_index):
+        return
+
+    # label/help/placeholder are part of the widget id; keep them constant so the query survives reruns
+    query = st.text_input(
+        "🔍 Search movies the app has loaded:",
+        key="search_query",
+        placeholder="Start typing a title... typos are fine",
+        help="Searches every movie the app has loaded so far, not just this session's"
+    )
+    st.caption(f"{len(search_index)} movies searchable")
+    if not query.strip():
+        return
+
+    results = search_index.search(query, limit=SEARCH_RESULT_LIMIT)
+    if not results:
+        st.caption(f"No loaded movies match \"{query}\" yet.")
+        return
+
+    for movie in results:
+        col1, col2 = st.columns([4, 1])
+        with col1:
+            year = f" ({movie['year']})" if movie.get('year') else ""
+            rating = f" • ⭐ {movie['rating']}/10" if movie.get('rating') is not None else ""
+            st.markdown(f"**{movie['title']}**{year}{rating}")
+        with col2:
+            if st.button("🔍 Details", key=f"search_{movie['id']}", use_container_width=True):
+                st.session_state.search_selected_id = movie['id']
+
+    movie_id = st.session_state.get('search_selected_id')
+    if movie_id in {movie['id'] for movie in results}:
+        with st.spinner("Loading detailed movie information..."):
+            movie_details = api_client.get_movie_details(movie_id)
+        show_enhanced_movie_details(movie_details)
+        if st.button("❌ Close Search Result", type="secondary"):
+            del st.session_state.search_selected_id
+            st.rerun()
@@ -1,58 +1,61 @@
 """
 API client for communicating with the deployed TMDB-powered FastAPI backend
+
+Thin Streamlit adapter over the core client in services.movie_client: keeps
+the plain-value interface used by the app and renders each distinct error
+at most once per rerun.
 """
-import requests
 import streamlit as st
 from typing import List, Dict, Optional
-from utils.constants import API_BASE_URL
+from services.movie_client import ApiResult, MovieClient, movie_client
 
 class MovieAPIClient:
-    def __init__(self, base_url: str = API_BASE_URL):
-        self.base_url = base_url
-        self.timeout = 30  # Longer timeout for deployed backend
+    def __init__(self, core: Optional[MovieClient] = None):
+        self.core = core if core is not None else MovieClient()
+    
+    def begin_rerun(self):
+        """Forget which errors were shown; call once at the top of each script run"""
+        st.session_state._api_errors_shown = set()
+    
+    def _report(self, result: ApiResult, message: str):
+        """Render a failed result's error, once per rerun"""
+        if result.ok:
+            return
+        if result.saturated:
+            message = "Movie database is busy, please try again in a moment"
+        text = f"{message}: {result.error}"
+        shown = st.session_state.setdefault('_api_errors_shown', set())
+        if text not in shown:
+            shown.add(text)
+            st.error(text)
+    
+    def health_status(self) -> Dict:
+        """Cached backend status ('unknown', 'healthy', 'degraded' or 'unhealthy'); no network I/O"""
+        return self.core.health_status()
     
     def get_health(self) -> Dict:
         """Check if the API is healthy"""
-        try:
-            response = requests.get(f"{self.base_url.replace('/api', '')}/", timeout=self.timeout)
-            response.raise_for_status()
-            return {"status": "healthy"}
-        except requests.exceptions.RequestException as e:
-            st.error(f"Backend API is not responding: {e}")
-            return {"status": "unhealthy"}
+        result = self.core.get_health()
+        self._report(result, "Backend API is not responding")
+        return result.data
     
     def get_genres(self) -> List[str]:
         """Get all available movie genres"""
-        try:
-            response = requests.get(f"{self.base_url}/genres", timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("genres", [])
-        except requests.exceptions.RequestException as e:
-            st.error(f"Failed to fetch genres: {e}")
-            return []
+        result = self.core.get_genres()
+        self._report(result, "Failed to fetch genres")
+        return result.data or []
     
     def get_movie_recommendations(self, genre: str, count: int = 6) -> List[Dict]:
         """Get movie recommendations for a specific genre"""
-        try:
-            params = {"genre": genre, "count": count}
-            response = requests.get(f"{self.base_url}/movies/recommendations", params=params, timeout=self.timeout)
-            response.raise_for_status()
-            data = response.json()
-            return data.get("movies", [])
-        except requests.exceptions.RequestException as e:
-            st.error(f"Failed to fetch recommendations: {e}")
-            return []
+        result = self.core.get_movie_recommendations(genre, count)
+        self._report(result, "Failed to fetch recommendations")
+        return result.data or []
     
     def get_movie_details(self, movie_id: int) -> Optional[Dict]:
         """Get detailed information about a specific movie"""
-        try:
-            response = requests.get(f"{self.base_url}/movies/{movie_id}", timeout=self.timeout)
-            response.raise_for_status()
-            return response.json()
-        except requests.exceptions.RequestException as e:
-            st.error(f"Failed to fetch movie details: {e}")
-            return None
+        result = self.core.get_movie_details(movie_id)
+        self._report(result, "Failed to fetch movie details")
+        return result.data
 
-# Create global API client instance
-api_client = MovieAPIClient()
+# Create global API client instance over the shared core client
+api_client = MovieAPIClient(movie_client)
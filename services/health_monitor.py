@@ -0,0 +1,96 @@
+"""
+Passive backend health tracking from the outcomes of real API calls
+"""
+import threading
+import time
+from collections import deque
+from typing import Callable, Dict, Optional
+from utils.constants import (
+    HEALTH_WINDOW, HEALTH_UNHEALTHY_AFTER, HEALTH_DEGRADED_FAILURE_RATIO, HEALTH_SLOW_RESPONSE,
+    HEALTH_IDLE_PROBE_INTERVAL, HEALTH_SUSPECT_PROBE_INTERVAL
+)
+
+UNKNOWN = "unknown"
+HEALTHY = "healthy"
+DEGRADED = "degraded"
+UNHEALTHY = "unhealthy"
+
+
+class HealthMonitor:
+    """Infers backend status from the outcome and latency of every request the client makes.
+
+    Consecutive failures make the backend unhealthy; a window with too many
+    failures or slow (over HEALTH_SLOW_RESPONSE) successes makes it degraded.
+
+    Reading the status is a constant-time lookup. An active probe only runs,
+    in a background thread, when there has been no real traffic for a while
+    or when the status is not clearly healthy.
+    """
+
+    def __init__(self, probe: Optional[Callable[[], object]] = None):
+        self.probe = probe
+        self._outcomes = deque(maxlen=HEALTH_WINDOW)
+        self._bad_in_window = 0
+        self._consecutive_failures = 0
+        self._status = UNKNOWN
+        self._last_activity = 0.0
+        self._last_probe = 0.0
+        self._last_error: Optional[str] = None
+        self._probing = False
+        self._lock = threading.Lock()
+
+    def record_success(self, endpoint: str, seconds: float):
+        slow = seconds > HEALTH_SLOW_RESPONSE
+        self._record(True, slow, f"{endpoint}: slow response ({seconds:.1f}s)" if slow else None)
+
+    def record_failure(self, endpoint: str, error: str):
+        self._record(False, True, f"{endpoint}: {error}")
+
+    def _record(self, ok: bool, bad: bool, error: Optional[str] = None):
+        """bad marks outcomes that count towards degraded: failures and slow successes"""
+        with self._lock:
+            if len(self._outcomes) == self._outcomes.maxlen and self._outcomes[0]:
+                self._bad_in_window -= 1
+            self._outcomes.append(bad)
+            self._last_activity = time.monotonic()
+            if bad:
+                self._bad_in_window += 1
+                self._last_error = error
+            if ok:
+                self._consecutive_failures = 0
+            else:
+                self._consecutive_failures += 1
+            if self._consecutive_failures >= HEALTH_UNHEALTHY_AFTER:
+                self._status = UNHEALTHY
+            elif self._bad_in_window / len(self._outcomes) >= HEALTH_DEGRADED_FAILURE_RATIO:
+                self._status = DEGRADED
+            else:
+                self._status = HEALTHY
+
+    def status(self) -> Dict:
+        """Current status without any I/O; may kick off a background probe"""
+        self._maybe_probe()
+        return {"status": self._status, "last_error": self._last_error}
+
+    def _maybe_probe(self):
+        if self.probe is None:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._probing:
+                return
+            idle = now - self._last_activity >= HEALTH_IDLE_PROBE_INTERVAL
+            suspect = self._status != HEALTHY
+            interval = HEALTH_SUSPECT_PROBE_INTERVAL if suspect else HEALTH_IDLE_PROBE_INTERVAL
+            if not (idle or suspect) or now - self._last_probe < interval:
+                return
+            self._probing = True
+            self._last_probe = now
+        threading.Thread(target=self._run_probe, name="backend-health-probe", daemon=True).start()
+
+    def _run_probe(self):
+        try:
+            self.probe()  # Its outcome is recorded like any other request
+        finally:
+            with self._lock:
+                self._probing = False
@@ -0,0 +1,80 @@
+"""
+Per-endpoint latency tracking for adaptive timeouts and hedged requests
+"""
+import math
+import threading
+from collections import defaultdict, deque
+from typing import Dict, Optional
+from utils.constants import (
+    LATENCY_WINDOW, LATENCY_MIN_SAMPLES, ADAPTIVE_TIMEOUT_MULTIPLIER,
+    MIN_REQUEST_TIMEOUT, MAX_REQUEST_TIMEOUT, HEDGE_MAX_RATIO, HEDGE_BURST
+)
+
+
+class LatencyTracker:
+    """Sliding window of recent request durations per endpoint"""
+
+    def __init__(self, window: int = LATENCY_WINDOW):
+        self._samples: Dict[str, deque] = defaultdict(lambda: deque(maxlen=window))
+        self._lock = threading.Lock()
+
+    def record(self, endpoint: str, seconds: float):
+        with self._lock:
+            self._samples[endpoint].append(seconds)
+
+    def sample_count(self, endpoint: str) -> int:
+        return len(self._samples.get(endpoint, ()))
+
+    def percentile(self, endpoint: str, p: float) -> Optional[float]:
+        """Nearest-rank percentile of the window, or None until there are enough samples"""
+        with self._lock:
+            samples = sorted(self._samples.get(endpoint, ()))
+        if len(samples) < LATENCY_MIN_SAMPLES:
+            return None
+        rank = max(1, math.ceil(p / 100 * len(samples)))
+        return samples[rank - 1]
+
+    def timeout_for(self, endpoint: str) -> float:
+        """A generous multiple of p99, clamped; the maximum until the endpoint has history.
+
+        Timed-out requests are recorded at their timeout, so a backend that
+        slows down (or is waking from sleep) pushes the timeout back up.
+        """
+        p99 = self.percentile(endpoint, 99)
+        if p99 is None:
+            return MAX_REQUEST_TIMEOUT
+        return min(MAX_REQUEST_TIMEOUT, max(MIN_REQUEST_TIMEOUT, p99 * ADAPTIVE_TIMEOUT_MULTIPLIER))
+
+    def hedge_delay(self, endpoint: str) -> Optional[float]:
+        """How long to wait before sending a hedge: the endpoint's p95"""
+        return self.percentile(endpoint, 95)
+
+
+class HedgeBudget:
+    """Caps hedges to a fraction of primary requests.
+
+    Every primary request earns HEDGE_MAX_RATIO of a token (up to HEDGE_BURST)
+    and each hedge spends one, so hedging adds at most that fraction of load.
+    """
+
+    def __init__(self, ratio: float = HEDGE_MAX_RATIO, burst: float = HEDGE_BURST):
+        self.ratio = ratio
+        self.burst = burst
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+
+    def on_request(self):
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + self.ratio)
+
+    def try_spend(self) -> bool:
+        with self._lock:
+            if self._tokens >= 1:
+                self._tokens -= 1
+                return True
+            return False
+
+    def refund(self):
+        """Return a token spent on a hedge that was never sent"""
+        with self._lock:
+            self._tokens = min(self.burst, self._tokens + 1)
@@ -0,0 +1,231 @@
+"""
+Opt-in memory watchdog - attributes allocations to modules and sessions and
+sheds idle sessions' cached data when the process nears its memory ceiling
+
+Enable with MOVIE_MEMORY_WATCHDOG=1 (and optionally MOVIE_MEMORY_CEILING_MB).
+Reports are logged every MEMORY_REPORT_INTERVAL seconds and kept in
+memory_watchdog.last_report.
+"""
+import logging
+import os
+import sys
+import threading
+import time
+import tracemalloc
+from collections import defaultdict, deque
+from typing import Dict, List, Optional, Tuple
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
+from utils.constants import (
+    MEMORY_WATCHDOG_ENABLED, MEMORY_CEILING_MB, MEMORY_EVICT_THRESHOLD, MEMORY_EVICT_PER_CHECK, MEMORY_IDLE_SECONDS,
+    MEMORY_REPORT_INTERVAL, MEMORY_TRACE_FRAMES, MEMORY_TOP_N, EVICTABLE_SESSION_KEYS
+)
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+# The adapter and the core client it wraps are reported together
+MODULE_ALIASES = {"movie_client": "api_client"}
+_SKIP_TYPES = (type, type(sys), type(len), type(lambda: None), type(logger.info))
+
+
+def current_memory_bytes() -> int:
+    """Resident set size where /proc is available, else memory traced by tracemalloc"""
+    try:
+        with open("/proc/self/statm", "r") as f:
+            return int(f.read().split()[1]) * os.sysconf("SC_PAGE_SIZE")
+    except (OSError, ValueError, IndexError):
+        return tracemalloc.get_traced_memory()[0]
+
+
+def module_group(filename: str) -> str:
+    """Short name for where an allocation came from: our module name, or the third-party package"""
+    if filename.startswith(PROJECT_ROOT):
+        name = os.path.splitext(os.path.basename(filename))[0]
+        return MODULE_ALIASES.get(name, name)
+    for marker in ("site-packages" + os.sep, "dist-packages" + os.sep):
+        if marker in filename:
+            return filename.split(marker, 1)[1].split(os.sep, 1)[0]
+    return "stdlib/other"
+
+
+def deep_sizeof(obj) -> int:
+    """Approximate bytes reachable from obj, not following functions, modules or classes"""
+    seen = set()
+    stack = [obj]
+    total = 0
+    while stack:
+        item = stack.pop()
+        if id(item) in seen or isinstance(item, _SKIP_TYPES) or callable(item) and not hasattr(item, "__dict__"):
+            continue
+        seen.add(id(item))
+        total += sys.getsizeof(item, 0)  # Includes the buffer of NumPy arrays that own their data
+        if isinstance(item, dict):
+            stack.extend(item.keys())
+            stack.extend(item.values())
+        elif isinstance(item, (list, tuple, set, frozenset, deque)):
+            stack.extend(item)
+        elif not isinstance(item, (str, bytes, bytearray, int, float)):
+            if hasattr(item, "__dict__"):
+                stack.append(vars(item))
+            for slot in getattr(type(item), "__slots__", ()):
+                if hasattr(item, slot):
+                    stack.append(getattr(item, slot))
+    return total
+
+
+class MemoryWatchdog:
+    def __init__(self, ceiling_mb: float = MEMORY_CEILING_MB):
+        self.ceiling_bytes = int(ceiling_mb * 1024 * 1024)
+        self.last_report: Optional[Dict] = None
+        self._sessions: Dict[str, Tuple[object, float]] = {}
+        self._previous_snapshot: Optional[tracemalloc.Snapshot] = None
+        self._thread: Optional[threading.Thread] = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """Begin tracing and start the background reporter; safe to call on every rerun"""
+        with self._lock:
+            if self._thread is not None:
+                return
+            if not tracemalloc.is_tracing():
+                tracemalloc.start(MEMORY_TRACE_FRAMES)
+            self._thread = threading.Thread(target=self._run, name="memory-watchdog", daemon=True)
+            self._thread.start()
+
+    def touch_session(self):
+        """Record the current session as active; call once per rerun"""
+        ctx = get_script_run_ctx()
+        if ctx is None:
+            return
+        with self._lock:
+            self._sessions[ctx.session_id] = (ctx.session_state, time.monotonic())
+
+    def _run(self):
+        while True:
+            time.sleep(MEMORY_REPORT_INTERVAL)
+            try:
+                self.check()
+            except Exception:  # The watchdog must never take the app down
+                logger.exception("Memory watchdog check failed")
+
+    def check(self) -> Dict:
+        """Take a snapshot, report top growers and sessions, and evict if near the ceiling"""
+        self._forget_closed_sessions()
+        snapshot = tracemalloc.take_snapshot().filter_traces([
+            tracemalloc.Filter(False, tracemalloc.__file__),
+        ])
+        growers = self._module_growth(snapshot)
+        sessions, keys = self.session_sizes()
+        # RSS rarely shrinks after Python frees memory, so eviction is driven
+        # by traced memory, and its effect shows up on the next check
+        traced = tracemalloc.get_traced_memory()[0]
+
+        evicted = []
+        if traced >= self.ceiling_bytes * MEMORY_EVICT_THRESHOLD:
+            evicted = self._evict_idle_sessions(sessions)
+
+        self.last_report = {
+            "memory_mb": round(current_memory_bytes() / 1024 / 1024, 1),
+            "traced_mb": round(traced / 1024 / 1024, 1),
+            "ceiling_mb": round(self.ceiling_bytes / 1024 / 1024, 1),
+            "top_growers_kb": [(group, round(diff / 1024, 1)) for group, diff in growers[:MEMORY_TOP_N]],
+            "largest_sessions_kb": [
+                (session_id[:8], round(size / 1024, 1)) for session_id, size, _ in sessions[:MEMORY_TOP_N]
+            ],
+            "session_state_keys_kb": [(key, round(size / 1024, 1)) for key, size in keys[:MEMORY_TOP_N]],
+            "evicted_sessions": [session_id[:8] for session_id in evicted],
+        }
+        logger.info("Memory watchdog report: %s", self.last_report)
+        return self.last_report
+
+    def _module_growth(self, snapshot: tracemalloc.Snapshot) -> List[Tuple[str, int]]:
+        """Bytes allocated since the last check, per module.
+
+        Each allocation is charged to the innermost frame in this project
+        (so JSON decoding done for the API client counts as api_client), or
+        to the package of its innermost frame otherwise.
+        """
+        sizes = self._sizes_by_module(snapshot)
+        previous = self._sizes_by_module(self._previous_snapshot) if self._previous_snapshot else {}
+        self._previous_snapshot = snapshot
+        growth = {group: size - previous.get(group, 0) for group, size in sizes.items()}
+        return sorted(growth.items(), key=lambda item: item[1], reverse=True)
+
+    @staticmethod
+    def _sizes_by_module(snapshot: tracemalloc.Snapshot) -> Dict[str, int]:
+        sizes: Dict[str, int] = defaultdict(int)
+        for stat in snapshot.statistics("traceback"):
+            frames = list(stat.traceback)
+            owner = next((f.filename for f in reversed(frames) if f.filename.startswith(PROJECT_ROOT)), None)
+            sizes[module_group(owner or frames[-1].filename)] += stat.size
+        return sizes
+
+    def session_sizes(self) -> Tuple[List[Tuple[str, int, float]], List[Tuple[str, int]]]:
+        """Approximate session_state sizes, largest first.
+
+        Returns (session id, bytes, seconds idle) per session, and bytes per
+        session_state key summed over all sessions.
+        """
+        now = time.monotonic()
+        with self._lock:
+            sessions = list(self._sessions.items())
+        sizes = []
+        key_sizes: Dict[str, int] = defaultdict(int)
+        for session_id, (state, last_seen) in sessions:
+            total = 0
+            for key, value in state.filtered_state.items():
+                size = deep_sizeof(value)
+                key_sizes[key] += size
+                total += size
+            sizes.append((session_id, total, now - last_seen))
+        sizes.sort(key=lambda item: item[1], reverse=True)
+        return sizes, sorted(key_sizes.items(), key=lambda item: item[1], reverse=True)
+
+    def _evict_idle_sessions(self, sessions: List[Tuple[str, int, float]]) -> List[str]:
+        """Drop re-fetchable data from up to MEMORY_EVICT_PER_CHECK of the largest idle sessions"""
+        evicted = []
+        for session_id, _, idle in sessions:
+            if len(evicted) >= MEMORY_EVICT_PER_CHECK:
+                break
+            if idle < MEMORY_IDLE_SECONDS:
+                continue
+            with self._lock:
+                state = self._sessions.get(session_id, (None,))[0]
+            if state is not None and self._evict_session(state):
+                evicted.append(session_id)
+        if evicted:
+            logger.warning("Memory near ceiling; evicted cached data from %d idle sessions", len(evicted))
+        return evicted
+
+    @staticmethod
+    def _evict_session(state) -> bool:
+        """Drop a session's re-fetchable data, keeping what can't be rebuilt; False if there was none"""
+        dropped = False
+        rotator = state["rotator"] if "rotator" in state else None
+        if rotator is not None and rotator.drop_buffers():
+            dropped = True
+        for key in EVICTABLE_SESSION_KEYS:
+            if key in state:
+                del state[key]
+                dropped = True
+        return dropped
+
+    def _forget_closed_sessions(self):
+        if not Runtime.exists():
+            return
+        runtime = Runtime.instance()
+        with self._lock:
+            for session_id in [s for s in self._sessions if not runtime.is_active_session(s)]:
+                del self._sessions[session_id]
+
+
+memory_watchdog = MemoryWatchdog()
+
+
+def start_memory_watchdog():
+    """Start the watchdog and register this session, if enabled; call on every rerun"""
+    if not MEMORY_WATCHDOG_ENABLED:
+        return
+    memory_watchdog.start()
+    memory_watchdog.touch_session()
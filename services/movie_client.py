@@ -0,0 +1,266 @@
+"""
+Streamlit-independent core client for the TMDB-powered FastAPI backend
+
+Safe to use from background threads, warmup jobs, benchmarks and process
+pools. Methods never raise for backend problems; they return an ApiResult
+carrying either the data or a description of what went wrong.
+"""
+import contextvars
+import os
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from dataclasses import dataclass
+from typing import Any, Dict, Optional
+import requests
+from utils.constants import (
+    API_BASE_URL, GENRES_CACHE_TTL, DETAILS_CACHE_TTL,
+    WARM_RECOMMENDATIONS_TTL, WARM_SNAPSHOT_PATH, CACHE_SOCKET_PATH,
+    PRIORITY_INTERACTIVE, PRIORITY_PREFETCH, HEDGED_ENDPOINTS, HEDGE_ADMIT_WAIT
+)
+from services.health_monitor import HealthMonitor
+from services.latency import HedgeBudget, LatencyTracker
+from services.rate_limiter import BackendSaturated, RequestGovernor
+from services.response_cache import ResponseCache
+from services.shared_cache import SocketCache
+from services.search_index import search_index
+from services.tracing import tracer
+
+GENRES_CACHE_KEY = "genres"
+
+# Runs hedged requests so the caller can take whichever attempt finishes first
+_request_pool = ThreadPoolExecutor(max_workers=32, thread_name_prefix="movie-client")
+
+def recommendations_cache_key(genre: str, count: int) -> str:
+    return f"recommendations:{genre}:{count}"
+
+def details_cache_key(movie_id: int) -> str:
+    return f"details:{movie_id}"
+
+def last_recommendations_cache_key(genre: str, count: int) -> str:
+    return f"last_recommendations:{genre}:{count}"
+
+def default_cache():
+    """The host-wide shared cache when MOVIE_CACHE_SOCKET is set, else a private one"""
+    if CACHE_SOCKET_PATH:
+        return SocketCache(CACHE_SOCKET_PATH)
+    return ResponseCache()
+
+
+@dataclass
+class ApiResult:
+    """Outcome of a client call: data on success, error text otherwise"""
+    data: Any = None
+    error: Optional[str] = None
+    saturated: bool = False  # Shed by the rate limiter rather than failed at the backend
+    stale: bool = False      # Served from expired cache because the backend was saturated
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+
+class MovieClient:
+    """Thread-safe backend client; the cache, governor and search index are all locked"""
+
+    def __init__(self, base_url: str = API_BASE_URL, cache=None,
+                 governor: Optional[RequestGovernor] = None):
+        self.base_url = base_url
+        # Any object with the ResponseCache interface, e.g. a SocketCache
+        self.cache = cache if cache is not None else default_cache()
+        self.governor = governor if governor is not None else RequestGovernor()
+        self.latency = LatencyTracker()
+        self.hedge_budget = HedgeBudget()
+        self.health = HealthMonitor(probe=self.get_health)
+
+    def __reduce__(self):
+        # Locks can't be pickled; a client sent to a worker process gets its own limits and default cache
+        return (self.__class__, (self.base_url,))
+
+    def _attempt(self, endpoint: str, url: str, params: Optional[Dict], priority: int,
+                 admit_timeout: Optional[float] = None,
+                 admitted: Optional[threading.Event] = None,
+                 abandoned: Optional[threading.Event] = None) -> requests.Response:
+        """One GET through the endpoint's rate limiter with an adaptive timeout, recording its latency.
+
+        admitted, if given, is set once the rate limiter lets the request
+        through; if abandoned is already set by then, nothing is sent.
+        """
+        with tracer.span(f"http.{endpoint}", url=url, priority=priority):
+            queued = time.monotonic()
+            with self.governor.slot(endpoint, priority, admit_timeout):
+                if admitted is not None:
+                    admitted.set()
+                if abandoned is not None and abandoned.is_set():
+                    raise BackendSaturated(f"{endpoint}: hedge no longer needed")
+                timeout = self.latency.timeout_for(endpoint)
+                started = time.monotonic()
+                tracer.annotate(queue_wait_ms=round((started - queued) * 1000, 1), timeout=timeout)
+                try:
+                    response = requests.get(url, params=params, timeout=timeout,
+                                            headers=tracer.propagation_headers())
+                except requests.exceptions.RequestException as e:
+                    if isinstance(e, requests.exceptions.Timeout):
+                        self.latency.record(endpoint, timeout)
+                    self.health.record_failure(endpoint, str(e))
+                    raise
+                elapsed = time.monotonic() - started
+                self.latency.record(endpoint, elapsed)
+            tracer.annotate(status=response.status_code)
+            if response.status_code >= 500:
+                self.health.record_failure(endpoint, f"HTTP {response.status_code}")
+            else:
+                self.health.record_success(endpoint, elapsed)
+            response.raise_for_status()
+            return response
+
+    def _get(self, endpoint: str, url: str, params: Optional[Dict] = None,
+             priority: int = PRIORITY_INTERACTIVE) -> requests.Response:
+        """GET, hedged for slow endpoints; raises BackendSaturated when shed.
+
+        If the first attempt hasn't answered within the endpoint's p95 latency
+        of being admitted by the rate limiter, an identical second GET is sent
+        and the first success wins. Time spent queueing is not counted, since
+        the p95 it is compared with is measured after admission. The hedge
+        queues behind interactive requests for at most HEDGE_ADMIT_WAIT, and
+        only hedges that are actually sent count against the hedge budget.
+        """
+        if endpoint not in HEDGED_ENDPOINTS:
+            return self._attempt(endpoint, url, params, priority)
+        # Only hedgeable traffic earns budget, so hedges stay within HEDGE_MAX_RATIO of it
+        self.hedge_budget.on_request()
+        delay = self.latency.hedge_delay(endpoint)
+        if delay is None:
+            return self._attempt(endpoint, url, params, priority)
+
+        # Each attempt runs in a copy of the caller's context so its span joins the caller's trace
+        admitted = threading.Event()
+        primary = _request_pool.submit(contextvars.copy_context().run, self._attempt,
+                                       endpoint, url, params, priority, None, admitted)
+        primary.add_done_callback(lambda _: admitted.set())  # Also wakes us if it was shed
+        admitted.wait()
+        done, _ = wait([primary], timeout=delay)
+        if done or not self.hedge_budget.try_spend():
+            return primary.result()
+
+        tracer.annotate(hedged=True)
+        settled = threading.Event()
+        hedge = _request_pool.submit(contextvars.copy_context().run, self._attempt, endpoint, url, params,
+                                     PRIORITY_PREFETCH, HEDGE_ADMIT_WAIT, None, settled)
+        hedge.add_done_callback(self._refund_if_shed)
+        try:
+            pending = {primary, hedge}
+            while pending:
+                done, pending = wait(pending, return_when=FIRST_COMPLETED)
+                for future in done:
+                    if future.exception() is None:
+                        return future.result()
+            # Both failed; the primary's error is the meaningful one (the hedge may just have been shed)
+            raise primary.exception()
+        finally:
+            settled.set()  # A hedge still queued in the rate limiter is not sent
+
+    def _refund_if_shed(self, hedge):
+        """Give the budget back for a hedge that was shed or abandoned before being sent"""
+        if isinstance(hedge.exception(), BackendSaturated):
+            self.hedge_budget.refund()
+
+    def _failure(self, error: requests.exceptions.RequestException, stale_key: Optional[str] = None) -> ApiResult:
+        """Turn an exception into an ApiResult, serving stale cache if the request was shed"""
+        saturated = isinstance(error, BackendSaturated)
+        if saturated and stale_key is not None:
+            stale = self.cache.get_stale(stale_key)
+            if stale is not None:
+                return ApiResult(data=stale, stale=True)
+        return ApiResult(error=str(error), saturated=saturated)
+
+    def health_status(self) -> Dict:
+        """Backend status inferred from recent calls; constant time, never blocks on the network"""
+        return self.health.status()
+
+    @tracer.traced("client.get_health")
+    def get_health(self) -> ApiResult:
+        """Actively probe the backend root; normally only the health monitor calls this"""
+        try:
+            self._get("health", f"{self.base_url.replace('/api', '')}/")
+            return ApiResult(data={"status": "healthy"})
+        except requests.exceptions.RequestException as e:
+            result = self._failure(e)
+            result.data = {"status": "unhealthy"}
+            return result
+
+    @tracer.traced("client.get_genres")
+    def get_genres(self) -> ApiResult:
+        """Get all available movie genres"""
+        cached = self.cache.get(GENRES_CACHE_KEY)
+        if cached is not None:
+            return ApiResult(data=cached)
+        try:
+            response = self._get("genres", f"{self.base_url}/genres")
+            genres = response.json().get("genres", [])
+        except requests.exceptions.RequestException as e:
+            return self._failure(e, GENRES_CACHE_KEY)
+        if genres:
+            self.cache.set(GENRES_CACHE_KEY, genres, ttl=GENRES_CACHE_TTL)
+        return ApiResult(data=genres)
+
+    @tracer.traced("client.get_movie_recommendations")
+    def get_movie_recommendations(self, genre: str, count: int = 6) -> ApiResult:
+        """Get movie recommendations for a specific genre"""
+        # Pre-warmed batches are served once so repeated requests still get variety
+        warmed = self.cache.pop(recommendations_cache_key(genre, count))
+        if warmed:
+            search_index.add_movies(warmed)
+            return ApiResult(data=warmed)
+        stale_key = last_recommendations_cache_key(genre, count)
+        try:
+            params = {"genre": genre, "count": count}
+            response = self._get("recommendations", f"{self.base_url}/movies/recommendations", params=params)
+            movies = response.json().get("movies", [])
+        except requests.exceptions.RequestException as e:
+            return self._failure(e, stale_key)
+        search_index.add_movies(movies)
+        if movies:
+            # Already expired: only ever served stale, when the backend is saturated
+            self.cache.set(stale_key, movies, ttl=0)
+        return ApiResult(data=movies)
+
+    @tracer.traced("client.prefetch_recommendations")
+    def prefetch_recommendations(self, genre: str, count: int) -> ApiResult:
+        """Fetch a recommendations batch and park it in the cache for the next caller"""
+        try:
+            params = {"genre": genre, "count": count}
+            response = self._get("recommendations", f"{self.base_url}/movies/recommendations",
+                                 params=params, priority=PRIORITY_PREFETCH)
+            movies = response.json().get("movies", [])
+        except requests.exceptions.RequestException as e:
+            return self._failure(e)
+        if movies:
+            self.cache.set(recommendations_cache_key(genre, count), movies, ttl=WARM_RECOMMENDATIONS_TTL)
+        return ApiResult(data=movies)
+
+    @tracer.traced("client.get_movie_details")
+    def get_movie_details(self, movie_id: int, priority: int = PRIORITY_INTERACTIVE) -> ApiResult:
+        """Get detailed information about a specific movie"""
+        cache_key = details_cache_key(movie_id)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            # May have been fetched by another worker sharing the cache
+            search_index.add_movie(cached)
+            return ApiResult(data=cached)
+        try:
+            response = self._get("details", f"{self.base_url}/movies/{movie_id}", priority=priority)
+            movie = response.json()
+        except requests.exceptions.RequestException as e:
+            return self._failure(e, cache_key)
+        if movie:
+            search_index.add_movie(movie)
+            self.cache.set(cache_key, movie, ttl=DETAILS_CACHE_TTL)
+        return ApiResult(data=movie)
+
+
+# Shared core client, starting warm if the warmup job left a snapshot
+# (a shared cache server loads the snapshot itself)
+movie_client = MovieClient()
+if not CACHE_SOCKET_PATH and os.path.exists(WARM_SNAPSHOT_PATH):
+    movie_client.cache.load_snapshot(WARM_SNAPSHOT_PATH)
@@ -0,0 +1,105 @@
+"""
+Tiny blurred poster placeholders and responsive TMDB poster URLs
+
+Placeholders are generated with Pillow from TMDB's smallest poster size and
+cached per movie id in the client's response cache (shared across workers
+when the shared cache is enabled), so each poster is only processed once.
+Rendering never waits for them: warmup.py precomputes placeholders for
+popular movies and the rest are filled in the background.
+"""
+import base64
+import io
+import re
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Dict, Iterable, List, Optional, Tuple
+import requests
+from PIL import Image, ImageFilter
+from utils.constants import (
+    PLACEHOLDER_CACHE_TTL, PLACEHOLDER_FAILURE_TTL, PLACEHOLDER_FETCH_TIMEOUT, PLACEHOLDER_SIZE, POSTER_WIDTHS
+)
+from services.movie_client import movie_client
+
+_TMDB_SIZE_RE = re.compile(r"(/t/p/)(w\d+|original)(/)")
+_placeholder_pool = ThreadPoolExecutor(max_workers=6, thread_name_prefix="poster-placeholder")
+_in_flight = set()  # Movie ids with a background generation queued or running
+_in_flight_lock = threading.Lock()
+
+
+def poster_url_for_width(poster_url: str, width: int) -> Optional[str]:
+    """The same TMDB poster at another width, or None if the URL isn't a TMDB image"""
+    if not _TMDB_SIZE_RE.search(poster_url or ""):
+        return None
+    return _TMDB_SIZE_RE.sub(rf"\g<1>w{width}\g<3>", poster_url, count=1)
+
+
+def poster_srcset(poster_url: str, widths: Iterable[int] = POSTER_WIDTHS) -> str:
+    """srcset listing the TMDB renditions of a poster, empty for non-TMDB URLs"""
+    candidates = [(poster_url_for_width(poster_url, width), width) for width in widths]
+    return ", ".join(f"{url} {width}w" for url, width in candidates if url)
+
+
+def _placeholder_cache_key(movie_id: int) -> str:
+    return f"placeholder:{movie_id}"
+
+
+def build_placeholder(image_bytes: bytes, size: Tuple[int, int] = PLACEHOLDER_SIZE) -> str:
+    """Downscale and blur an image into a JPEG data URI of a few hundred bytes"""
+    with Image.open(io.BytesIO(image_bytes)) as image:
+        thumbnail = image.convert("RGB").resize(size, Image.Resampling.BILINEAR)
+    thumbnail = thumbnail.filter(ImageFilter.GaussianBlur(radius=1))
+    buffer = io.BytesIO()
+    thumbnail.save(buffer, format="JPEG", quality=40, optimize=True)
+    return "data:image/jpeg;base64," + base64.b64encode(buffer.getvalue()).decode("ascii")
+
+
+def _generate(movie_id: int, poster_url: str, cache) -> str:
+    source_url = poster_url_for_width(poster_url, min(POSTER_WIDTHS)) or poster_url
+    try:
+        response = requests.get(source_url, timeout=PLACEHOLDER_FETCH_TIMEOUT)
+        response.raise_for_status()
+        placeholder = build_placeholder(response.content)
+        ttl = PLACEHOLDER_CACHE_TTL
+    except (requests.exceptions.RequestException, OSError, ValueError):
+        # Remember the failure briefly, so we don't retry on every rerun but do recover
+        placeholder = ""
+        ttl = PLACEHOLDER_FAILURE_TTL
+    cache.set(_placeholder_cache_key(movie_id), placeholder, ttl=ttl)
+    return placeholder
+
+
+def _generate_in_background(movie_id: int, poster_url: str):
+    try:
+        _generate(movie_id, poster_url, movie_client.cache)
+    finally:
+        with _in_flight_lock:
+            _in_flight.discard(movie_id)
+
+
+def placeholders_for(movies: List[Dict]) -> Dict[int, str]:
+    """Cached data-URI placeholders keyed by movie id; never waits on the network.
+
+    Missing placeholders are generated in the background and show up on a
+    later rerun; warmup.py precomputes them for popular movies.
+    """
+    placeholders = {}
+    for movie in movies:
+        if not movie.get('poster_url'):
+            continue
+        cached = movie_client.cache.get(_placeholder_cache_key(movie['id']))
+        if cached:
+            placeholders[movie['id']] = cached
+        elif cached is None:
+            with _in_flight_lock:
+                if movie['id'] in _in_flight:
+                    continue
+                _in_flight.add(movie['id'])
+            _placeholder_pool.submit(_generate_in_background, movie['id'], movie['poster_url'])
+    return placeholders
+
+
+def warm_placeholders(movies: Iterable[Dict], cache) -> int:
+    """Generate placeholders for movies into cache, waiting for all; returns how many succeeded"""
+    unique = {movie['id']: movie['poster_url'] for movie in movies if movie.get('poster_url')}
+    results = _placeholder_pool.map(lambda item: _generate(item[0], item[1], cache), unique.items())
+    return sum(1 for placeholder in results if placeholder)
@@ -0,0 +1,133 @@
+"""
+Outbound request governor - token-bucket rate limiting plus a bounded number of
+in-flight requests per backend endpoint, shared by every session in the process
+"""
+import heapq
+import itertools
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+import requests
+from utils.constants import (
+    ENDPOINT_LIMITS, GOVERNOR_MAX_QUEUE, GOVERNOR_MAX_WAIT,
+    PRIORITY_INTERACTIVE
+)
+
+
+class BackendSaturated(requests.exceptions.RequestException):
+    """Raised when a request is shed because the endpoint's queue is full or the wait timed out"""
+
+
+class TokenBucket:
+    """Classic token bucket; callers must hold the owning governor's lock"""
+
+    def __init__(self, rate: float, burst: int):
+        self.rate = rate
+        self.burst = burst
+        self._tokens = float(burst)
+        self._updated = time.monotonic()
+
+    def try_acquire(self) -> float:
+        """Take a token and return 0, or return the seconds until one is available"""
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+        if self._tokens >= 1:
+            self._tokens -= 1
+            return 0.0
+        return (1 - self._tokens) / self.rate
+
+
+class EndpointGovernor:
+    """Admits requests to one endpoint in priority order.
+
+    A request proceeds once it is first in the queue, a concurrency slot is
+    free and the token bucket has a token. Interactive requests always sort
+    ahead of prefetch ones, and prefetch requests are shed as soon as the
+    queue is half full so user clicks keep the remaining room.
+    """
+
+    def __init__(self, name: str, rate: float, burst: int, max_in_flight: int,
+                 max_queue: int = GOVERNOR_MAX_QUEUE):
+        self.name = name
+        self.max_in_flight = max_in_flight
+        self.max_queue = max_queue
+        self._bucket = TokenBucket(rate, burst)
+        self._cond = threading.Condition()
+        self._waiters = []
+        self._sequence = itertools.count()
+        self._in_flight = 0
+        self.shed_count = 0
+
+    @property
+    def queue_length(self) -> int:
+        return len(self._waiters)
+
+    @property
+    def in_flight(self) -> int:
+        return self._in_flight
+
+    def acquire(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        """Block until the request may be sent, or raise BackendSaturated"""
+        if timeout is None:
+            timeout = GOVERNOR_MAX_WAIT[priority]
+        deadline = time.monotonic() + timeout
+        with self._cond:
+            queue_limit = self.max_queue if priority == PRIORITY_INTERACTIVE else self.max_queue // 2
+            if len(self._waiters) >= queue_limit:
+                self.shed_count += 1
+                raise BackendSaturated(f"{self.name}: {len(self._waiters)} requests already queued")
+
+            entry = (priority, next(self._sequence))
+            heapq.heappush(self._waiters, entry)
+            try:
+                while True:
+                    retry_in = None
+                    if self._waiters[0] == entry and self._in_flight < self.max_in_flight:
+                        retry_in = self._bucket.try_acquire()
+                        if retry_in == 0:
+                            heapq.heappop(self._waiters)
+                            self._in_flight += 1
+                            # The next waiter may be able to go straight away
+                            self._cond.notify_all()
+                            return
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        self.shed_count += 1
+                        raise BackendSaturated(f"{self.name}: timed out waiting for a request slot")
+                    self._cond.wait(min(retry_in, remaining) if retry_in else remaining)
+            except BaseException:
+                if entry in self._waiters:
+                    self._waiters.remove(entry)
+                    heapq.heapify(self._waiters)
+                    self._cond.notify_all()
+                raise
+
+    def release(self):
+        with self._cond:
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    @contextmanager
+    def slot(self, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        self.acquire(priority, timeout)
+        try:
+            yield
+        finally:
+            self.release()
+
+
+class RequestGovernor:
+    """One EndpointGovernor per backend endpoint, configured from ENDPOINT_LIMITS"""
+
+    def __init__(self, limits: Dict[str, Dict] = ENDPOINT_LIMITS):
+        self._governors = {
+            name: EndpointGovernor(name, **config) for name, config in limits.items()
+        }
+
+    def __getitem__(self, endpoint: str) -> EndpointGovernor:
+        return self._governors[endpoint]
+
+    def slot(self, endpoint: str, priority: int = PRIORITY_INTERACTIVE, timeout: Optional[float] = None):
+        return self._governors[endpoint].slot(priority, timeout)
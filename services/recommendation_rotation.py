@@ -0,0 +1,97 @@
+"""
+Repeat-avoiding recommendation rotation for a single session
+"""
+import hashlib
+from collections import deque
+from typing import Callable, Dict, List
+from utils.constants import (
+    MAX_RECOMMENDATION_COUNT, ROTATION_OVERFETCH_FACTOR, ROTATION_MAX_FETCHES,
+    SEEN_FILTER_BITS, SEEN_FILTER_HASHES
+)
+
+
+def fetch_size(count: int) -> int:
+    """How many movies to request from the backend to serve a batch of count"""
+    return min(MAX_RECOMMENDATION_COUNT, count * ROTATION_OVERFETCH_FACTOR)
+
+
+class SeenFilter:
+    """Bloom filter over movie ids - 1 KB (SEEN_FILTER_BITS) regardless of session length.
+
+    A false positive only means an unseen movie is skipped, never that a
+    repeat slips through.
+    """
+
+    def __init__(self, bits: int = SEEN_FILTER_BITS, hashes: int = SEEN_FILTER_HASHES):
+        self.bits = bits
+        self.hashes = hashes
+        self._array = bytearray((bits + 7) // 8)
+        self.count = 0
+
+    def _positions(self, movie_id) -> List[int]:
+        digest = hashlib.blake2b(str(movie_id).encode(), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], "little")
+        second = int.from_bytes(digest[8:], "little") | 1
+        # Kirsch-Mitzenmacher: k positions from two hashes
+        return [(first + i * second) % self.bits for i in range(self.hashes)]
+
+    def add(self, movie_id):
+        for position in self._positions(movie_id):
+            self._array[position >> 3] |= 1 << (position & 7)
+        self.count += 1
+
+    def __contains__(self, movie_id) -> bool:
+        return all(self._array[p >> 3] & (1 << (p & 7)) for p in self._positions(movie_id))
+
+
+class RecommendationRotator:
+    """Serves batches of not-yet-seen movies per genre from a locally buffered pool.
+
+    The backend is asked for more movies than are shown; the unseen surplus
+    is kept per genre so the next "Get Different Movies" is usually answered
+    without a round trip.
+    """
+
+    def __init__(self, fetch: Callable[[str, int], List[Dict]]):
+        self.fetch = fetch
+        self.seen = SeenFilter()
+        self._pools: Dict[str, deque] = {}
+
+    def buffered(self, genre: str) -> int:
+        return len(self._pools.get(genre, ()))
+
+    def drop_buffers(self) -> int:
+        """Forget the buffered pools (they can be re-fetched) but keep the seen set; returns movies dropped"""
+        dropped = sum(len(pool) for pool in self._pools.values())
+        self._pools.clear()
+        return dropped
+
+    def next_batch(self, genre: str, count: int) -> List[Dict]:
+        """Up to count movies from genre that this session hasn't been shown yet"""
+        pool = self._pools.setdefault(genre, deque())
+        batch = self._take_unseen(pool, count)
+        fetches = 0
+        last_fetched: List[Dict] = []
+        while len(batch) < count and fetches < ROTATION_MAX_FETCHES:
+            last_fetched = self.fetch(genre, fetch_size(count))
+            fetches += 1
+            if not last_fetched:
+                break
+            pooled_ids = {movie['id'] for movie in pool} | {movie['id'] for movie in batch}
+            pool.extend(m for m in last_fetched if m['id'] not in self.seen and m['id'] not in pooled_ids)
+            batch += self._take_unseen(pool, count - len(batch))
+
+        if not batch:
+            # The genre looks exhausted; repeats beat an empty page
+            batch = last_fetched[:count]
+        for movie in batch:
+            self.seen.add(movie['id'])
+        return batch
+
+    def _take_unseen(self, pool: deque, count: int) -> List[Dict]:
+        batch = []
+        while pool and len(batch) < count:
+            movie = pool.popleft()
+            if movie['id'] not in self.seen:
+                batch.append(movie)
+        return batch
@@ -0,0 +1,101 @@
+"""
+In-process response cache for backend data, with JSON snapshot support
+"""
+import json
+import os
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Optional
+from utils.constants import CACHE_MAX_ENTRIES
+
+
+class ResponseCache:
+    """Thread-safe LRU cache with per-entry expiry.
+
+    Values must be JSON-serializable so the whole cache can be written to a
+    snapshot file by the warmup job and loaded by fresh replicas.
+    """
+
+    def __init__(self, max_entries: int = CACHE_MAX_ENTRIES):
+        self.max_entries = max_entries
+        self._entries: "OrderedDict[str, tuple]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def get(self, key: str) -> Optional[Any]:
+        """Return the cached value, or None if missing or expired"""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            value, expires_at = entry
+            if expires_at is not None and expires_at <= time.time():
+                # Expired entries stay until evicted so they can still be served stale
+                return None
+            self._entries.move_to_end(key)
+            return value
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        """Return the cached value even if it has expired, for use when the backend is unavailable"""
+        with self._lock:
+            entry = self._entries.get(key)
+        return entry[0] if entry is not None else None
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        """Store a value; ttl is in seconds, None means no expiry"""
+        expires_at = time.time() + ttl if ttl is not None else None
+        with self._lock:
+            self._entries[key] = (value, expires_at)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+
+    def pop(self, key: str) -> Optional[Any]:
+        """Remove and return a live value, for entries that should be served only once"""
+        with self._lock:
+            entry = self._entries.pop(key, None)
+        if entry is None:
+            return None
+        value, expires_at = entry
+        if expires_at is not None and expires_at <= time.time():
+            return None
+        return value
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+    def save_snapshot(self, path: str) -> int:
+        """Write all live entries to a JSON file atomically; returns the number written"""
+        now = time.time()
+        with self._lock:
+            entries = {
+                key: {"value": value, "expires_at": expires_at}
+                for key, (value, expires_at) in self._entries.items()
+                if expires_at is None or expires_at > now
+            }
+        directory = os.path.dirname(path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump({"created_at": now, "entries": entries}, f)
+        os.replace(tmp_path, path)
+        return len(entries)
+
+    def load_snapshot(self, path: str) -> int:
+        """Merge live entries from a snapshot file; returns the number loaded"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        now = time.time()
+        loaded = 0
+        for key, entry in data.get("entries", {}).items():
+            expires_at = entry.get("expires_at")
+            if expires_at is not None and expires_at <= now:
+                continue
+            self.set(key, entry["value"], ttl=expires_at - now if expires_at is not None else None)
+            loaded += 1
+        return loaded
@@ -0,0 +1,238 @@
+"""
+In-memory incremental title search index for movies received from the backend
+"""
+import json
+import os
+import re
+import threading
+import unicodedata
+from collections import OrderedDict, defaultdict
+from typing import Dict, Iterable, List, Optional, Set
+from utils.constants import SEARCH_CATALOG_PATH, SEARCH_INDEX_MAX_MOVIES, SEARCH_INDEX_FIELDS
+
+NGRAM_SIZE = 3
+MAX_TYPOS = 2
+
+_WORD_RE = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text: str) -> str:
+    """Lowercase and strip accents so 'Amélie' matches 'amelie'"""
+    decomposed = unicodedata.normalize("NFKD", text or "")
+    return "".join(c for c in decomposed if not unicodedata.combining(c)).lower()
+
+
+def tokenize(text: str) -> List[str]:
+    """Split text into normalized alphanumeric words"""
+    return _WORD_RE.findall(normalize_text(text))
+
+
+def ngrams(word: str, n: int = NGRAM_SIZE) -> Set[str]:
+    """Padded character n-grams of a word, used for typo-tolerant lookup"""
+    padded = f"  {word} "
+    return {padded[i:i + n] for i in range(len(padded) - n + 1)}
+
+
+def bounded_edit_distance(a: str, b: str, limit: int) -> int:
+    """Edit distance (adjacent transpositions count once), giving up early once it exceeds limit"""
+    if abs(len(a) - len(b)) > limit:
+        return limit + 1
+    before_previous: List[int] = []
+    previous = list(range(len(b) + 1))
+    for i, ca in enumerate(a, 1):
+        current = [i]
+        row_min = i
+        for j, cb in enumerate(b, 1):
+            cost = min(previous[j] + 1, current[j - 1] + 1, previous[j - 1] + (ca != cb))
+            if i > 1 and j > 1 and ca == b[j - 2] and a[i - 2] == cb:
+                cost = min(cost, before_previous[j - 2] + 1)
+            current.append(cost)
+            row_min = min(row_min, cost)
+        # A transposition can still reach back to the previous row, so both must be over the limit
+        if row_min > limit and min(previous) >= limit:
+            return limit + 1
+        before_previous, previous = previous, current
+    return previous[-1]
+
+
+class _TrieNode:
+    __slots__ = ("children", "movie_ids")
+
+    def __init__(self):
+        self.children: Dict[str, "_TrieNode"] = {}
+        self.movie_ids: Set[int] = set()
+
+
+class MovieSearchIndex:
+    """Prefix trie plus trigram inverted index over movie titles.
+
+    Movies are added incrementally as the API client receives them, so
+    as-you-type queries are answered locally without a backend round trip.
+    Only the fields a result row shows are kept, and at most max_movies
+    movies, dropping the least recently received first.
+    Exact word prefixes are served by the trie; the trigram index supplies
+    candidates for misspelled words, which are confirmed with a bounded
+    edit distance.
+    """
+
+    def __init__(self, max_movies: int = SEARCH_INDEX_MAX_MOVIES):
+        self.max_movies = max_movies
+        self._lock = threading.RLock()
+        self._movies: "OrderedDict[int, Dict]" = OrderedDict()
+        self._words: Dict[int, List[str]] = {}
+        self._trie = _TrieNode()
+        self._ngram_index: Dict[str, Set[str]] = defaultdict(set)
+        self._word_ids: Dict[str, Set[int]] = defaultdict(set)
+
+    def __len__(self) -> int:
+        return len(self._movies)
+
+    def add_movie(self, movie: Dict):
+        """Index a single movie dict; richer records replace earlier ones"""
+        movie_id = movie.get("id")
+        title = movie.get("title")
+        if movie_id is None or not title:
+            return
+        record = {field: movie[field] for field in SEARCH_INDEX_FIELDS if field in movie}
+        with self._lock:
+            existing = self._movies.get(movie_id)
+            if existing is not None:
+                # List entries and details responses may each lack fields; keep the union
+                self._movies[movie_id] = {**existing, **record}
+                self._movies.move_to_end(movie_id)
+                if existing.get("title") == title:
+                    return
+                self._unindex_words(movie_id)
+            else:
+                self._movies[movie_id] = record
+            words = tokenize(title)
+            self._words[movie_id] = words
+            for word in words:
+                self._index_word(word, movie_id)
+            while len(self._movies) > self.max_movies:
+                oldest, _ = self._movies.popitem(last=False)
+                self._unindex_words(oldest)
+
+    def add_movies(self, movies: Iterable[Dict]):
+        """Index a batch of movie dicts"""
+        with self._lock:
+            for movie in movies or []:
+                self.add_movie(movie)
+
+    def load_catalog(self, path: str) -> int:
+        """Seed the index from an offline JSON catalog; returns the number of movies loaded"""
+        with open(path, "r", encoding="utf-8") as f:
+            data = json.load(f)
+        movies = data.get("movies", []) if isinstance(data, dict) else data
+        before = len(self)
+        self.add_movies(movies)
+        return len(self) - before
+
+    def search(self, query: str, limit: int = 10) -> List[Dict]:
+        """Return up to limit movies whose titles match every word of the query.
+
+        The last query word is treated as a prefix since the user may still be
+        typing it; the other words must match a title word exactly or within
+        a small number of typos.
+        """
+        terms = tokenize(query)
+        if not terms:
+            return []
+        with self._lock:
+            scores: Optional[Dict[int, float]] = None
+            for position, term in enumerate(terms):
+                is_last = position == len(terms) - 1
+                term_scores = self._match_term(term, prefix=is_last)
+                if scores is None:
+                    scores = term_scores
+                else:
+                    scores = {
+                        movie_id: scores[movie_id] + score
+                        for movie_id, score in term_scores.items()
+                        if movie_id in scores
+                    }
+                if not scores:
+                    return []
+            ranked = sorted(
+                scores.items(),
+                key=lambda item: (-item[1], -(self._movies[item[0]].get("rating") or 0)),
+            )
+            return [dict(self._movies[movie_id]) for movie_id, _ in ranked[:limit]]
+
+    def _match_term(self, term: str, prefix: bool) -> Dict[int, float]:
+        """Score movies for a single query term; exact > prefix > fuzzy"""
+        scores: Dict[int, float] = {}
+        for movie_id in self._word_ids.get(term, ()):
+            scores[movie_id] = 3.0
+        if prefix:
+            node = self._find_node(term)
+            if node is not None:
+                for movie_id in node.movie_ids:
+                    scores.setdefault(movie_id, 2.0)
+        if len(term) >= NGRAM_SIZE:
+            max_typos = min(MAX_TYPOS, max(1, len(term) // 4))
+            for word in self._fuzzy_candidates(term):
+                target = word[:len(term)] if prefix and len(word) > len(term) else word
+                distance = bounded_edit_distance(term, target, max_typos)
+                if distance <= max_typos:
+                    for movie_id in self._word_ids[word]:
+                        scores.setdefault(movie_id, 1.0 - distance / (max_typos + 1))
+        return scores
+
+    def _fuzzy_candidates(self, term: str) -> Set[str]:
+        """Indexed words sharing enough trigrams with term to be worth an edit-distance check"""
+        grams = ngrams(term)
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for word in self._ngram_index.get(gram, ()):
+                counts[word] += 1
+        # Each edit destroys at most NGRAM_SIZE trigrams
+        threshold = max(1, len(grams) - NGRAM_SIZE * MAX_TYPOS)
+        return {word for word, count in counts.items() if count >= threshold}
+
+    def _index_word(self, word: str, movie_id: int):
+        node = self._trie
+        node.movie_ids.add(movie_id)
+        for char in word:
+            node = node.children.setdefault(char, _TrieNode())
+            node.movie_ids.add(movie_id)
+        if not self._word_ids[word]:
+            for gram in ngrams(word):
+                self._ngram_index[gram].add(word)
+        self._word_ids[word].add(movie_id)
+
+    def _unindex_words(self, movie_id: int):
+        for word in self._words.pop(movie_id, []):
+            node = self._trie
+            node.movie_ids.discard(movie_id)
+            for char in word:
+                child = node.children.get(char)
+                if child is None:
+                    break
+                child.movie_ids.discard(movie_id)
+                if not child.movie_ids:
+                    # Nothing below is used by any other movie; prune so evictions free memory
+                    del node.children[char]
+                    break
+                node = child
+            ids = self._word_ids.get(word)
+            if ids is not None:
+                ids.discard(movie_id)
+                if not ids:
+                    del self._word_ids[word]
+                    for gram in ngrams(word):
+                        self._ngram_index[gram].discard(word)
+
+    def _find_node(self, prefix: str) -> Optional[_TrieNode]:
+        node = self._trie
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return None
+        return node
+
+
+# Shared index fed by the global API client, optionally seeded from the offline catalog
+search_index = MovieSearchIndex()
+if os.path.exists(SEARCH_CATALOG_PATH):
+    search_index.load_catalog(SEARCH_CATALOG_PATH)
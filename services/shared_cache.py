@@ -0,0 +1,214 @@
+"""
+Host-wide response cache shared by every Streamlit worker over a Unix socket
+
+One cache server process per host holds the only copy of the cached movie
+data; each worker talks to it through SocketCache, which has the same
+interface as the in-process ResponseCache and can be passed to MovieClient.
+
+Start the server before the workers (e.g. from the same supervisor):
+
+    python -m services.shared_cache --socket /tmp/movie-cache.sock --snapshot data/warm_cache.json
+
+and point the workers at it with MOVIE_CACHE_SOCKET=/tmp/movie-cache.sock.
+If the server is unreachable, SocketCache degrades to a private
+ResponseCache so the app keeps working.
+"""
+import argparse
+import json
+import os
+import socket
+import socketserver
+import struct
+import threading
+import time
+from typing import Any, Optional
+from utils.constants import SHARED_CACHE_MAX_ENTRIES
+from services.response_cache import ResponseCache
+
+_HEADER = struct.Struct("!I")
+RECONNECT_INTERVAL = 5.0  # Seconds to stay on the local fallback after the server goes away
+
+
+def _send(sock: socket.socket, message: dict):
+    payload = json.dumps(message).encode("utf-8")
+    sock.sendall(_HEADER.pack(len(payload)) + payload)
+
+
+def _recv(sock: socket.socket) -> Optional[dict]:
+    header = _recv_exactly(sock, _HEADER.size)
+    if header is None:
+        return None
+    payload = _recv_exactly(sock, _HEADER.unpack(header)[0])
+    if payload is None:
+        return None
+    return json.loads(payload.decode("utf-8"))
+
+
+def _recv_exactly(sock: socket.socket, size: int) -> Optional[bytes]:
+    chunks = []
+    while size:
+        chunk = sock.recv(size)
+        if not chunk:
+            return None
+        chunks.append(chunk)
+        size -= len(chunk)
+    return b"".join(chunks)
+
+
+class _CacheRequestHandler(socketserver.BaseRequestHandler):
+    """Serves length-prefixed JSON operations on one persistent worker connection"""
+
+    def handle(self):
+        cache: ResponseCache = self.server.cache
+        while True:
+            try:
+                message = _recv(self.request)
+            except (OSError, ValueError):
+                return
+            if message is None:
+                return
+            op, key = message.get("op"), message.get("key")
+            try:
+                if op == "get":
+                    reply = {"value": cache.get(key)}
+                elif op == "get_stale":
+                    reply = {"value": cache.get_stale(key)}
+                elif op == "set":
+                    cache.set(key, message["value"], ttl=message.get("ttl"))
+                    reply = {}
+                elif op == "pop":
+                    reply = {"value": cache.pop(key)}
+                elif op == "clear":
+                    cache.clear()
+                    reply = {}
+                elif op == "len":
+                    reply = {"value": len(cache)}
+                elif op == "save_snapshot":
+                    reply = {"value": cache.save_snapshot(message["path"])}
+                elif op == "load_snapshot":
+                    reply = {"value": cache.load_snapshot(message["path"])}
+                else:
+                    reply = {"error": f"unknown op {op!r}"}
+            except (OSError, ValueError, KeyError) as e:
+                reply = {"error": str(e)}
+            try:
+                _send(self.request, reply)
+            except OSError:
+                return
+
+
+class SharedCacheServer(socketserver.ThreadingMixIn, socketserver.UnixStreamServer):
+    """Unix-socket server owning the host's single ResponseCache"""
+    daemon_threads = True
+
+    def __init__(self, socket_path: str, max_entries: int = SHARED_CACHE_MAX_ENTRIES):
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)  # Left over from a previous server
+        self.cache = ResponseCache(max_entries=max_entries)
+        super().__init__(socket_path, _CacheRequestHandler)
+
+
+class SocketCache:
+    """ResponseCache-compatible client for SharedCacheServer.
+
+    Each thread keeps its own persistent connection. A socket error or an
+    error reply on any thread drops every thread of this worker to a private
+    ResponseCache for RECONNECT_INTERVAL seconds, after which the server is
+    tried again.
+    """
+
+    def __init__(self, socket_path: str, timeout: float = 1.0):
+        self.socket_path = socket_path
+        self.timeout = timeout
+        self.fallback = ResponseCache()
+        self._local = threading.local()
+        self._down_until = 0.0
+
+    def __len__(self) -> int:
+        return self._call("len", fallback=lambda: len(self.fallback)) or 0
+
+    def get(self, key: str) -> Optional[Any]:
+        return self._call("get", key, fallback=lambda: self.fallback.get(key))
+
+    def get_stale(self, key: str) -> Optional[Any]:
+        return self._call("get_stale", key, fallback=lambda: self.fallback.get_stale(key))
+
+    def set(self, key: str, value: Any, ttl: Optional[float] = None):
+        self._call("set", key, value=value, ttl=ttl, fallback=lambda: self.fallback.set(key, value, ttl))
+
+    def pop(self, key: str) -> Optional[Any]:
+        return self._call("pop", key, fallback=lambda: self.fallback.pop(key))
+
+    def clear(self):
+        self.fallback.clear()
+        self._call("clear", fallback=lambda: None)
+
+    def save_snapshot(self, path: str) -> int:
+        """Have the server write its snapshot; path is resolved on the server's side"""
+        return self._call("save_snapshot", path=os.path.abspath(path),
+                          fallback=lambda: self.fallback.save_snapshot(path))
+
+    def load_snapshot(self, path: str) -> int:
+        return self._call("load_snapshot", path=os.path.abspath(path),
+                          fallback=lambda: self.fallback.load_snapshot(path))
+
+    def _call(self, op: str, key: Optional[str] = None, fallback=None, **fields):
+        if time.monotonic() < self._down_until:
+            return fallback()
+        message = {"op": op, "key": key, **fields}
+        try:
+            sock = self._connection()
+            _send(sock, message)
+            reply = _recv(sock)
+            if reply is None:
+                raise ConnectionError("shared cache server closed the connection")
+            if "error" in reply:
+                raise ConnectionError(f"shared cache {op} failed: {reply['error']}")
+        except (OSError, ValueError):
+            self._disconnect()
+            self._down_until = time.monotonic() + RECONNECT_INTERVAL
+            return fallback()
+        return reply.get("value")
+
+    def _connection(self) -> socket.socket:
+        sock = getattr(self._local, "sock", None)
+        if sock is None:
+            sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+            sock.settimeout(self.timeout)
+            try:
+                sock.connect(self.socket_path)
+            except OSError:
+                sock.close()
+                raise
+            self._local.sock = sock
+        return sock
+
+    def _disconnect(self):
+        sock = getattr(self._local, "sock", None)
+        if sock is not None:
+            sock.close()
+            self._local.sock = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description="Run the host-wide shared movie cache server")
+    parser.add_argument("--socket", required=True, help="Unix socket path the workers connect to")
+    parser.add_argument("--max-entries", type=int, default=SHARED_CACHE_MAX_ENTRIES,
+                        help="LRU capacity (default: %(default)s)")
+    parser.add_argument("--snapshot", default=None, help="Warm cache snapshot to load on startup")
+    args = parser.parse_args(argv)
+
+    server = SharedCacheServer(args.socket, max_entries=args.max_entries)
+    if args.snapshot and os.path.exists(args.snapshot):
+        print(f"Loaded {server.cache.load_snapshot(args.snapshot)} entries from {args.snapshot}")
+    print(f"Shared cache listening on {args.socket}")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.server_close()
+        os.unlink(args.socket)
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,139 @@
+"""
+Lightweight span tracing from Streamlit rerun down to backend calls
+
+Each sampled rerun becomes a trace; spans are written as Chrome Trace Event
+JSON, which opens offline in https://ui.perfetto.dev or chrome://tracing.
+Outgoing backend requests carry a W3C `traceparent` header so backend logs
+can be joined to the frontend trace. Sampling is decided once per trace, so
+unsampled reruns cost little more than a context-variable lookup per span.
+"""
+import contextvars
+import functools
+import json
+import os
+import random
+import threading
+import time
+from contextlib import contextmanager
+from typing import Dict, Optional
+from utils.constants import TRACE_FILE, TRACE_SAMPLE_RATE
+
+_current_span: contextvars.ContextVar = contextvars.ContextVar("current_span", default=None)
+
+
+class Span:
+    __slots__ = ("name", "trace_id", "span_id", "parent_id", "sampled", "start", "attributes")
+
+    def __init__(self, name: str, trace_id: str, parent_id: Optional[str], sampled: bool, attributes: Dict):
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = os.urandom(8).hex()
+        self.parent_id = parent_id
+        self.sampled = sampled
+        self.start = time.time()
+        self.attributes = attributes
+
+    def set(self, key: str, value):
+        self.attributes[key] = value
+
+    @property
+    def traceparent(self) -> str:
+        return f"00-{self.trace_id}-{self.span_id}-{'01' if self.sampled else '00'}"
+
+
+class TraceExporter:
+    """Appends finished spans to a Chrome Trace Event file (JSON array, left open-ended)"""
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.Lock()
+        self._pid = os.getpid()
+
+    def export(self, span: Span, end: float):
+        event = {
+            "name": span.name,
+            "cat": span.name.split(".", 1)[0],
+            "ph": "X",
+            "ts": int(span.start * 1e6),
+            "dur": max(1, int((end - span.start) * 1e6)),
+            "pid": self._pid,
+            "tid": threading.get_ident(),
+            "args": {
+                "trace_id": span.trace_id,
+                "span_id": span.span_id,
+                "parent_id": span.parent_id,
+                **{k: v if isinstance(v, (int, float, bool)) else str(v) for k, v in span.attributes.items()},
+            },
+        }
+        line = json.dumps(event) + ",\n"
+        with self._lock:
+            directory = os.path.dirname(self.path)
+            if directory:
+                os.makedirs(directory, exist_ok=True)
+            new_file = not os.path.exists(self.path)
+            with open(self.path, "a", encoding="utf-8") as f:
+                # The trace event format allows the closing bracket to be omitted
+                f.write(("[\n" if new_file else "") + line)
+
+
+class Tracer:
+    def __init__(self, exporter: TraceExporter, sample_rate: float = TRACE_SAMPLE_RATE):
+        self.exporter = exporter
+        self.sample_rate = sample_rate
+
+    @contextmanager
+    def start_trace(self, name: str, **attributes):
+        """Open a root span, deciding whether this whole trace is sampled"""
+        sampled = self.sample_rate > 0 and random.random() < self.sample_rate
+        with self._span(name, os.urandom(16).hex(), None, sampled, attributes) as span:
+            yield span
+
+    @contextmanager
+    def span(self, name: str, **attributes):
+        """Child span of the current one; a no-op when there is no sampled trace"""
+        parent = _current_span.get()
+        if parent is None or not parent.sampled:
+            yield parent
+            return
+        with self._span(name, parent.trace_id, parent.span_id, True, attributes) as span:
+            yield span
+
+    @contextmanager
+    def _span(self, name, trace_id, parent_id, sampled, attributes):
+        span = Span(name, trace_id, parent_id, sampled, attributes)
+        token = _current_span.set(span)
+        try:
+            yield span
+        except BaseException as e:
+            span.set("error", repr(e))
+            raise
+        finally:
+            _current_span.reset(token)
+            if sampled:
+                self.exporter.export(span, time.time())
+
+    def traced(self, name: str):
+        """Decorator form of span()"""
+        def decorator(func):
+            @functools.wraps(func)
+            def wrapper(*args, **kwargs):
+                with self.span(name):
+                    return func(*args, **kwargs)
+            return wrapper
+        return decorator
+
+    @staticmethod
+    def annotate(**attributes):
+        """Attach attributes to the current span if it is being recorded"""
+        span = _current_span.get()
+        if span is not None and span.sampled:
+            span.attributes.update(attributes)
+
+    @staticmethod
+    def propagation_headers() -> Dict[str, str]:
+        """traceparent header for the current span, if any"""
+        span = _current_span.get()
+        return {"traceparent": span.traceparent} if span is not None else {}
+
+
+tracer = Tracer(TraceExporter(TRACE_FILE))
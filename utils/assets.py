@@ -0,0 +1,95 @@
+"""
+Static CSS pipeline - bundles and minifies the stylesheets once per process and
+serves the result as a content-hashed static file
+"""
+import glob
+import hashlib
+import os
+import re
+from functools import lru_cache
+import streamlit.components.v1 as components
+from utils.constants import CSS_SOURCES, STATIC_CSS_DIR
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_WHITESPACE_RE = re.compile(r"\s+")
+_PUNCTUATION_RE = re.compile(r"\s*([{};:,>])\s*")
+
+
+def minify_css(css: str) -> str:
+    """Strip comments and redundant whitespace; good enough for our hand-written CSS"""
+    css = _COMMENT_RE.sub("", css)
+    css = _WHITESPACE_RE.sub(" ", css)
+    css = _PUNCTUATION_RE.sub(r"\1", css)
+    return css.replace(";}", "}").strip()
+
+
+@lru_cache(maxsize=1)
+def build_css_bundle() -> str:
+    """Bundle CSS_SOURCES into static/css/bundle.<hash>.css and return its URL path.
+
+    The hash changes whenever any source changes, so browsers can cache the
+    file indefinitely: the URL carries a ?v=<hash> query, for which Tornado's
+    static handler sends a ten-year Cache-Control instead of relying on ETag
+    revalidation. Older bundles are removed.
+    """
+    parts = []
+    for source in CSS_SOURCES:
+        with open(os.path.join(PROJECT_ROOT, source), "r", encoding="utf-8") as f:
+            parts.append(f.read())
+    bundle = minify_css("\n".join(parts))
+    digest = hashlib.sha256(bundle.encode("utf-8")).hexdigest()[:12]
+
+    output_dir = os.path.join(PROJECT_ROOT, STATIC_CSS_DIR)
+    os.makedirs(output_dir, exist_ok=True)
+    filename = f"bundle.{digest}.css"
+    path = os.path.join(output_dir, filename)
+    if not os.path.exists(path):
+        tmp_path = f"{path}.{os.getpid()}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.write(bundle)
+        os.replace(tmp_path, path)
+    for stale in glob.glob(os.path.join(output_dir, "bundle.*.css")):
+        if os.path.basename(stale) != filename:
+            try:
+                os.remove(stale)
+            except OSError:
+                pass  # Another worker got there first
+
+    # Streamlit serves <app dir>/static/ under app/static/ when enableStaticServing is on
+    return "app/" + "/".join([*STATIC_CSS_DIR.split(os.sep), filename]) + f"?v={digest}"
+
+
+def inject_styles():
+    """Reference the CSS bundle from the page instead of re-sending the stylesheet.
+
+    Streamlit's static handler serves .css as text/plain, which browsers refuse
+    as a <link> stylesheet, so a zero-height component fetches the (HTTP-cached)
+    bundle once and adds it to the parent page's <head>. Each rerun only
+    re-sends this small loader.
+
+    The trade-off is that the first paint of each page load is unstyled until
+    the loader has run; later reruns keep the <style> already in the page.
+    """
+    url = build_css_bundle()
+    bundle_id = os.path.basename(url.split("?", 1)[0])
+    components.html(f"""
+    <script>
+    (function() {{
+        const doc = window.parent.document;
+        if (doc.getElementById("{bundle_id}")) return;
+        fetch(new URL("{url}", doc.baseURI))
+            .then((response) => response.ok ? response.text() : Promise.reject(response.status))
+            .then((css) => {{
+                doc.querySelectorAll("style[data-css-bundle]").forEach((old) => old.remove());
+                const style = doc.createElement("style");
+                style.id = "{bundle_id}";
+                style.dataset.cssBundle = "";
+                style.textContent = css;
+                doc.head.appendChild(style);
+            }})
+            .catch((error) => console.warn("Could not load {url}", error));
+    }})();
+    </script>
+    """, height=0)
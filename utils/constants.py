@@ -1,6 +1,10 @@
 """
 Constants and configuration for the movie recommendation app with TMDB
 """
+import os
+
+# Default file paths are anchored here (the directory holding app.py), not the working directory
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 
 # API Configuration - Updated for deployed backend with TMDB
 API_BASE_URL = "https://movie-recommendation-backend-2-fur6.onrender.com/api"
@@ -31,3 +35,89 @@ GENRE_CONFIG = {
 MOVIES_PER_ROW = 3
 DEFAULT_RECOMMENDATION_COUNT = 6
 MAX_RECOMMENDATION_COUNT = 20
+RECOMMENDATION_COUNTS = [3, 6, 9, 12, 15]  # Choices offered in the "Movies to show" selectbox
+
+# Recommendation Rotation - avoid showing a session the same movie twice
+ROTATION_OVERFETCH_FACTOR = 3  # Request this many times the shown count, buffer the rest
+ROTATION_MAX_FETCHES = 2       # Backend calls per batch before settling for a short batch
+SEEN_FILTER_BITS = 8192        # Bloom filter size: 1 KB, ~1% false positives at 850 movies
+SEEN_FILTER_HASHES = 6
+
+# Cache Configuration
+CACHE_MAX_ENTRIES = 2048
+GENRES_CACHE_TTL = 60 * 60               # Genre list rarely changes
+DETAILS_CACHE_TTL = 24 * 60 * 60         # Movie details are effectively static
+WARM_RECOMMENDATIONS_TTL = 6 * 60 * 60   # Pre-fetched batches, each served once
+WARM_SNAPSHOT_PATH = os.path.join(PROJECT_ROOT, "data", "warm_cache.json")
+CACHE_SOCKET_PATH = os.environ.get("MOVIE_CACHE_SOCKET", "")  # Set to share one cache across workers
+SHARED_CACHE_MAX_ENTRIES = 20000
+
+# Outbound Request Limits - per backend endpoint, shared by all sessions in the process
+PRIORITY_INTERACTIVE = 0  # User clicks
+PRIORITY_PREFETCH = 1     # Warmup and other background fetches
+ENDPOINT_LIMITS = {
+    "health": {"rate": 1.0, "burst": 3, "max_in_flight": 1},
+    "genres": {"rate": 2.0, "burst": 5, "max_in_flight": 2},
+    "recommendations": {"rate": 4.0, "burst": 8, "max_in_flight": 4},
+    "details": {"rate": 8.0, "burst": 16, "max_in_flight": 6},
+}
+GOVERNOR_MAX_QUEUE = 32
+GOVERNOR_MAX_WAIT = {PRIORITY_INTERACTIVE: 10.0, PRIORITY_PREFETCH: 2.0}  # Seconds before shedding
+
+# Adaptive Timeouts and Hedging
+LATENCY_WINDOW = 200               # Recent requests kept per endpoint
+LATENCY_MIN_SAMPLES = 20           # Below this, use MAX_REQUEST_TIMEOUT and don't hedge
+ADAPTIVE_TIMEOUT_MULTIPLIER = 3.0  # Timeout = p99 x this, clamped below
+MIN_REQUEST_TIMEOUT = 5.0
+MAX_REQUEST_TIMEOUT = 30.0         # Longer timeout for deployed backend (it may be waking up)
+HEDGED_ENDPOINTS = ("recommendations", "details")
+HEDGE_MAX_RATIO = 0.1              # Hedges add at most 10% extra requests
+HEDGE_BURST = 5
+HEDGE_ADMIT_WAIT = 0.25            # Seconds a hedge may queue in the rate limiter before giving up
+
+# Backend Health - inferred from real requests, probed only when idle or suspect
+HEALTH_WINDOW = 20                   # Recent request outcomes considered
+HEALTH_UNHEALTHY_AFTER = 3           # Consecutive failures before reporting unhealthy
+HEALTH_DEGRADED_FAILURE_RATIO = 0.2  # Share of failed or slow requests in the window that counts as degraded
+HEALTH_SLOW_RESPONSE = 3.0           # Seconds; successful responses slower than this count against health
+HEALTH_IDLE_PROBE_INTERVAL = 60.0    # Seconds without traffic before an active probe
+HEALTH_SUSPECT_PROBE_INTERVAL = 5.0  # Probe spacing while not healthy
+
+# Tracing - share of reruns traced end to end, and where spans are written
+TRACE_SAMPLE_RATE = float(os.environ.get("MOVIE_TRACE_SAMPLE_RATE", "0"))
+TRACE_FILE = os.environ.get("MOVIE_TRACE_FILE", os.path.join(PROJECT_ROOT, "traces", "trace.json"))
+
+# Memory Watchdog - opt-in tracemalloc reporting and idle-session eviction
+MEMORY_WATCHDOG_ENABLED = os.environ.get("MOVIE_MEMORY_WATCHDOG", "") not in ("", "0")
+MEMORY_CEILING_MB = float(os.environ.get("MOVIE_MEMORY_CEILING_MB", "1024"))
+MEMORY_EVICT_THRESHOLD = 0.9     # Share of the ceiling (in Python-traced memory) at which idle sessions are evicted
+MEMORY_EVICT_PER_CHECK = 3       # Idle sessions evicted per check at most; the effect is measured on the next one
+MEMORY_IDLE_SECONDS = 300.0      # Sessions without a rerun this long count as idle
+MEMORY_REPORT_INTERVAL = 60.0    # Seconds between snapshots / reports
+MEMORY_TRACE_FRAMES = 10         # Traceback depth kept by tracemalloc
+MEMORY_TOP_N = 5                 # Entries per list in each report
+# Session keys holding re-fetchable data; a returning session simply reloads them.
+# The rotator is not listed: only its buffered pools are dropped, since its seen set can't be rebuilt.
+EVICTABLE_SESSION_KEYS = ["current_movies", "selected_movie_id", "show_details_for"]
+
+# Warmup Configuration - genres pre-fetched first, in priority order
+WARMUP_GENRES = ["Action", "Comedy", "Drama", "Adventure", "Thriller", "Horror", "Sci-Fi", "Romance"]
+
+# Static Assets - bundled in this order into one hashed stylesheet
+CSS_SOURCES = ["assets/style.css", "assets/app.css", "assets/components.css"]
+STATIC_CSS_DIR = "static/css"
+
+# Poster Images - TMDB renditions offered via srcset, and the blurred placeholders
+POSTER_WIDTHS = [92, 185, 342, 500, 780]
+POSTER_GRID = {"width": 200, "height": 300, "sizes": "(max-width: 640px) 90vw, (max-width: 1024px) 30vw, 200px"}
+POSTER_DETAIL = {"width": 300, "height": 450, "sizes": "(max-width: 640px) 90vw, 300px"}
+PLACEHOLDER_SIZE = (10, 15)  # Pixels; keeps each data URI to a few hundred bytes
+PLACEHOLDER_CACHE_TTL = 7 * 24 * 60 * 60
+PLACEHOLDER_FAILURE_TTL = 5 * 60  # Failed downloads are retried after this long
+PLACEHOLDER_FETCH_TIMEOUT = 5.0  # Seconds per poster download (background and warmup only)
+
+# Search Configuration
+SEARCH_CATALOG_PATH = os.path.join(PROJECT_ROOT, "data", "catalog.json")  # Optional offline catalog used to seed the search index
+SEARCH_RESULT_LIMIT = 9
+SEARCH_INDEX_MAX_MOVIES = 20000  # Process-wide cap; least recently received movies are dropped first
+SEARCH_INDEX_FIELDS = ["id", "title", "year", "rating"]  # All a search result shows; details are fetched on click
@@ -0,0 +1,124 @@
+"""
+NumPy-backed analytics over every movie viewed during a discovery session
+"""
+from typing import Dict, Iterable, List, Optional, Tuple
+import numpy as np
+
+FIRST_DECADE = 1870  # Roughly the first films on TMDB
+DECADE_BUCKETS = 20  # 1870s through 2060s
+RATING_BINS = 10     # One bucket per rating point on the 0-10 scale
+RATING_STEPS = 101   # Percentile histogram: one bucket per 0.1 on the 0-10 scale
+
+
+class SessionAnalytics:
+    """Incrementally maintained rating/year/genre statistics for one session.
+
+    Each batch of movies is vectorised once with NumPy and folded into
+    fixed-size histograms and running sums; only the set of counted ids grows
+    with the history, and rendering the stats panel never walks it. Each movie id is
+    counted once no matter how often it is shown.
+    """
+
+    def __init__(self):
+        self._size = 0
+        self._seen_ids = set()
+        self._genre_names: List[str] = []
+        self._genre_codes: Dict[str, int] = {}
+        self._genre_counts = np.zeros(0, dtype=np.int64)
+        self._decade_counts = np.zeros(DECADE_BUCKETS, dtype=np.int64)
+        self._rating_counts = np.zeros(RATING_BINS, dtype=np.int64)
+        self._rating_steps = np.zeros(RATING_STEPS, dtype=np.int64)
+        self._rating_sum = 0.0
+        self._rated = 0
+        self.total_views = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def record_movies(self, movies: Iterable[Dict]):
+        """Add a batch of movie dicts to the history, skipping ones already counted"""
+        batch = []
+        for movie in movies or []:
+            self.total_views += 1
+            movie_id = movie.get('id')
+            if movie_id in self._seen_ids:
+                continue
+            self._seen_ids.add(movie_id)
+            batch.append(movie)
+        if not batch:
+            return
+
+        ratings = np.array(
+            [m['rating'] if m.get('rating') is not None else np.nan for m in batch],
+            dtype=np.float32
+        )
+        years = np.array([_parse_year(m.get('year')) for m in batch], dtype=np.int16)
+        genres = np.array([self._genre_code(m.get('genre') or "Unknown") for m in batch], dtype=np.int16)
+
+        self._size += len(batch)
+
+        rated = ratings[~np.isnan(ratings)]
+        self._rating_sum += float(rated.sum())
+        self._rated += rated.size
+        np.add.at(self._rating_counts, np.clip(rated.astype(np.int64), 0, RATING_BINS - 1), 1)
+        np.add.at(self._rating_steps, np.clip(np.rint(rated * 10).astype(np.int64), 0, RATING_STEPS - 1), 1)
+
+        dated = years[years > 0]
+        decades = np.clip((dated - FIRST_DECADE) // 10, 0, DECADE_BUCKETS - 1)
+        np.add.at(self._decade_counts, decades, 1)
+
+        if self._genre_counts.size < len(self._genre_names):
+            self._genre_counts = np.pad(self._genre_counts, (0, len(self._genre_names) - self._genre_counts.size))
+        np.add.at(self._genre_counts, genres, 1)
+
+    def average_rating(self) -> Optional[float]:
+        """Mean rating across all rated movies this session"""
+        if not self._rated:
+            return None
+        return self._rating_sum / self._rated
+
+    def rating_percentiles(self, percentiles: Tuple[int, ...] = (25, 50, 75, 90)) -> Dict[int, float]:
+        """Nearest-rank rating percentiles, to 0.1, from the running histogram"""
+        if not self._rated:
+            return {}
+        cumulative = np.cumsum(self._rating_steps)
+        ranks = np.maximum(1, np.ceil(np.asarray(percentiles) / 100 * self._rated))
+        steps = np.searchsorted(cumulative, ranks)
+        return {p: float(step) / 10 for p, step in zip(percentiles, steps)}
+
+    def rating_distribution(self) -> Dict[str, int]:
+        """Count of movies per whole rating point, e.g. {'7-8': 4}"""
+        return {f"{i}-{i + 1}": int(c) for i, c in enumerate(self._rating_counts)}
+
+    def genre_mix(self, top: Optional[int] = None) -> List[Tuple[str, float]]:
+        """(genre, share of movies) pairs, most common first"""
+        if not self._size:
+            return []
+        order = np.argsort(-self._genre_counts, kind="stable")
+        if top is not None:
+            order = order[:top]
+        return [(self._genre_names[i], float(self._genre_counts[i]) / self._size) for i in order]
+
+    def decade_histogram(self) -> Dict[str, int]:
+        """Count of movies per release decade, covering only decades that appear"""
+        nonzero = np.flatnonzero(self._decade_counts)
+        if not nonzero.size:
+            return {}
+        span = range(nonzero[0], nonzero[-1] + 1)
+        return {f"{FIRST_DECADE + 10 * i}s": int(self._decade_counts[i]) for i in span}
+
+    def _genre_code(self, genre: str) -> int:
+        code = self._genre_codes.get(genre)
+        if code is None:
+            code = len(self._genre_names)
+            self._genre_codes[genre] = code
+            self._genre_names.append(genre)
+        return code
+
+
+def _parse_year(year) -> int:
+    """Best-effort year from an int or a 'YYYY' / 'YYYY-MM-DD' string; 0 when unknown"""
+    try:
+        return int(str(year)[:4])
+    except (TypeError, ValueError):
+        return 0
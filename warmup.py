@@ -0,0 +1,87 @@
+"""
+Cache warmup job - pre-fetches popular genres so fresh replicas start warm
+
+Run at deploy time and on a schedule, e.g. every few hours from cron:
+
+    python warmup.py --top-genres 8 --snapshot data/warm_cache.json
+
+The app loads the snapshot on startup, so the first users of a cold replica
+get recommendations and details without waiting on the backend.
+"""
+import argparse
+import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List
+from services.movie_client import MovieClient
+from services.poster_placeholders import warm_placeholders
+from services.recommendation_rotation import fetch_size
+from utils.constants import PRIORITY_PREFETCH, RECOMMENDATION_COUNTS, WARM_SNAPSHOT_PATH, WARMUP_GENRES
+
+def pick_genres(available_genres: List[str], top: int) -> List[str]:
+    """Preferred warmup genres that the backend offers, topped up from its own list"""
+    available = set(available_genres)
+    genres = [genre for genre in WARMUP_GENRES if genre in available]
+    genres += [genre for genre in available_genres if genre not in genres]
+    return genres[:top]
+
+def warm_cache(client: MovieClient, genres: List[str], counts: List[int],
+               include_details: bool = True, include_placeholders: bool = True, workers: int = 4) -> dict:
+    """Pre-fetch recommendations (their details and poster placeholders) for every genre/count pair"""
+    stats = {"batches": 0, "details": 0, "placeholders": 0, "failures": 0}
+    pairs = [(genre, count) for genre in genres for count in counts]
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        batches = [result.data or [] for result in pool.map(lambda pair: client.prefetch_recommendations(*pair), pairs)]
+        stats["batches"] = sum(1 for movies in batches if movies)
+        stats["failures"] += sum(1 for movies in batches if not movies)
+
+        if include_details:
+            movie_ids = {movie["id"] for movies in batches for movie in movies}
+            details = list(pool.map(lambda movie_id: client.get_movie_details(movie_id, PRIORITY_PREFETCH), movie_ids))
+            stats["details"] = sum(1 for result in details if result.ok)
+            stats["failures"] += sum(1 for result in details if not result.ok)
+
+    if include_placeholders:
+        # The grid never waits for placeholders, so popular ones are built here ahead of time
+        stats["placeholders"] = warm_placeholders((movie for movies in batches for movie in movies), client.cache)
+
+    return stats
+
+def main(argv=None) -> int:
+    parser = argparse.ArgumentParser(description="Pre-fetch popular movie data into the warm cache snapshot")
+    parser.add_argument("--top-genres", type=int, default=len(WARMUP_GENRES),
+                        help="How many genres to warm (default: %(default)s)")
+    # The app over-fetches, so warm the batch sizes it actually requests
+    default_counts = sorted({fetch_size(count) for count in RECOMMENDATION_COUNTS})
+    parser.add_argument("--counts", type=int, nargs="+", default=default_counts,
+                        help="Recommendation batch sizes to warm for each genre (default: %(default)s)")
+    parser.add_argument("--no-details", action="store_true", help="Skip pre-fetching movie details")
+    parser.add_argument("--no-placeholders", action="store_true", help="Skip building blurred poster placeholders")
+    parser.add_argument("--snapshot", default=WARM_SNAPSHOT_PATH, help="Snapshot file to write (default: %(default)s)")
+    parser.add_argument("--workers", type=int, default=4, help="Concurrent backend requests (default: %(default)s)")
+    parser.add_argument("--base-url", default=None, help="Backend API base URL (default: from constants)")
+    args = parser.parse_args(argv)
+
+    client = MovieClient(args.base_url) if args.base_url else MovieClient()
+    started = time.time()
+
+    available_genres = client.get_genres().data
+    if not available_genres:
+        print("Could not fetch genres; backend may be asleep. Nothing warmed.", file=sys.stderr)
+        return 1
+
+    genres = pick_genres(available_genres, args.top_genres)
+    print(f"Warming {len(genres)} genres x {len(args.counts)} counts: {', '.join(genres)}")
+    stats = warm_cache(client, genres, args.counts, include_details=not args.no_details,
+                       include_placeholders=not args.no_placeholders, workers=args.workers)
+
+    written = client.cache.save_snapshot(args.snapshot)
+    print(f"Warmed {stats['batches']} recommendation batches, {stats['details']} movie details "
+          f"and {stats['placeholders']} poster placeholders "
+          f"({stats['failures']} failures) in {time.time() - started:.1f}s; "
+          f"wrote {written} entries to {args.snapshot}")
+    return 0 if stats["batches"] else 1
+
+if __name__ == "__main__":
+    sys.exit(main())